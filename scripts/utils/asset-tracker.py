@@ -22,7 +22,8 @@ import uuid
 import tempfile
 import whisper
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from functools import lru_cache
 
 # Initialize mime types
 mimetypes.init()
@@ -31,6 +32,28 @@ mimetypes.init()
 DB_PATH = os.path.expanduser("~/media-asset-tracker/asset-db.sqlite")
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
+# Per-thread database connections, see get_db_connection()
+_db_local = threading.local()
+
+def get_db_connection():
+    """
+    Return this thread's shared database connection, opening it on first use
+    
+    A single command calls several of the functions below in turn; sharing the
+    connection saves reopening the database and re-applying the PRAGMAs for
+    each of them. Callers commit as needed but must not close it.
+    """
+    conn = getattr(_db_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, timeout=60.0)
+        conn.execute('PRAGMA journal_mode=WAL')
+        # WAL is durable with NORMAL sync; only checkpoints need a full fsync
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-65536')  # 64 MiB page cache
+        _db_local.conn = conn
+    return conn
+
 def init_db():
     """Initialize the SQLite database with proper schema"""
     # Use a longer timeout and enable WAL mode for better concurrency
@@ -79,6 +102,9 @@ def init_db():
     
     # Create indexes for better performance
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_files_drive_id ON files (drive_id)')
+    
+    # Cached ffprobe output so unchanged media isn't probed again on re-catalog
+    create_probe_cache_table(cursor)
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_files_extension ON files (extension)')
     
     # Check if required columns exist, if not add them
@@ -118,6 +144,7 @@ def init_db():
         FOREIGN KEY (file_id) REFERENCES files (id)
     )
     ''')
+    create_project_file_counts(cursor)
     
     # Create indexes for faster searching
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_files_filename ON files (filename)')
@@ -125,6 +152,12 @@ def init_db():
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_name ON projects (name)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_client ON projects (client)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_files_transcription ON files (transcription_status)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_files_drive_path ON files (drive_id, path)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_files_checksum ON files (checksum)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_project_files_file ON project_files (file_id)')
+    
+    # Full-text index for filename/path searches
+    create_files_fts_table(cursor)
     
     conn.commit()
     conn.close()
@@ -134,11 +167,8 @@ def check_for_duplicate_drive(volume_name, mount_point, size_bytes, conn=None):
     Check if a drive with the same volume name already exists in the database
     Returns the drive info if found, None otherwise
     """
-    close_conn = False
     if conn is None:
-        conn = sqlite3.connect(DB_PATH, timeout=60.0)
-        conn.execute('PRAGMA journal_mode=WAL')
-        close_conn = True
+        conn = get_db_connection()
     
     cursor = conn.cursor()
     
@@ -155,14 +185,8 @@ def check_for_duplicate_drive(volume_name, mount_point, size_bytes, conn=None):
             drive_dict = {column_names[i]: row[i] for i in range(len(column_names))}
             results.append(drive_dict)
         
-        if close_conn:
-            conn.close()
-        
         return results
     
-    if close_conn:
-        conn.close()
-    
     return None
 
 def handle_duplicate_drive(duplicate_drives, new_drive_info, batch_mode=False, default_choice=None):
@@ -280,12 +304,9 @@ def handle_duplicate_drive(duplicate_drives, new_drive_info, batch_mode=False, d
 def get_file_count_for_drive(drive_id):
     """Get the number of files cataloged for a given drive"""
     try:
-        conn = sqlite3.connect(DB_PATH, timeout=60.0)
-        cursor = conn.cursor()
+        cursor = get_db_connection().cursor()
         cursor.execute("SELECT COUNT(*) FROM files WHERE drive_id = ?", (drive_id,))
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count
+        return cursor.fetchone()[0]
     except Exception as e:
         print(f"Error getting file count: {e}")
         return 0
@@ -293,11 +314,9 @@ def get_file_count_for_drive(drive_id):
 def delete_files_for_drive(drive_id):
     """Delete all files associated with a drive"""
     try:
-        conn = sqlite3.connect(DB_PATH, timeout=60.0)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM files WHERE drive_id = ?", (drive_id,))
+        conn = get_db_connection()
+        conn.execute("DELETE FROM files WHERE drive_id = ?", (drive_id,))
         conn.commit()
-        conn.close()
     except Exception as e:
         print(f"Error deleting files: {e}")
 
@@ -388,37 +407,34 @@ def get_drive_info(mount_point, batch_mode=False, duplicate_choice=None):
     
     return drive_info
 
-def calculate_checksum(file_path, algorithm="md5", buffer_size=8192):
-    """Calculate file checksum using specified algorithm"""
-    hash_algo = getattr(hashlib, algorithm)()
+def calculate_checksum(file_path, algorithm="md5", buffer_size=1 << 20):
+    """
+    Calculate file checksum using specified algorithm
     
-    try:
-        with open(file_path, "rb") as f:
+    Read errors are raised rather than printed, so catalog_files can report
+    them from the checksum pool alongside the file they belong to.
+    """
+    with open(file_path, "rb") as f:
+        # Python 3.11+ reads and hashes in C without holding the GIL
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, algorithm).hexdigest()
+        
+        hash_algo = hashlib.new(algorithm)
+        buffer = f.read(buffer_size)
+        while buffer:
+            hash_algo.update(buffer)
             buffer = f.read(buffer_size)
-            while buffer:
-                hash_algo.update(buffer)
-                buffer = f.read(buffer_size)
-        return hash_algo.hexdigest()
-    except Exception as e:
-        print(f"Error calculating checksum for {file_path}: {e}")
-        return None
+    return hash_algo.hexdigest()
 
 def get_media_info(file_path):
     """Extract media metadata using ffprobe (if installed)"""
     try:
-        # Check if ffprobe is available
-        subprocess.run(
-            ["ffprobe", "-version"], 
-            capture_output=True, 
-            check=True
-        )
-        
-        # Extract media info
+        # A missing ffprobe surfaces as FileNotFoundError below
         result = subprocess.run(
             [
                 "ffprobe", 
                 "-v", "quiet", 
-                "-print_format", "json", 
+                "-print_format", "json=compact=1",  # One line per section, no indentation
                 "-show_format", 
                 "-show_streams", 
                 file_path
@@ -435,7 +451,158 @@ def get_media_info(file_path):
         # ffprobe not installed
         return None
 
-def generate_video_thumbnail(video_path, output_dir=None, width=640, height=480):
+def create_probe_cache_table(cursor):
+    """Create the ffprobe cache table (also called on catalog for databases that predate it)"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS probe_cache (
+        path TEXT PRIMARY KEY,
+        size_bytes INTEGER,
+        mtime_ns INTEGER,
+        media_info TEXT
+    )
+    ''')
+
+def create_files_fts_table(cursor):
+    """
+    Create the files_fts full-text index and the triggers that keep it in sync
+    
+    The index is an external-content FTS5 table over files.filename and
+    files.path using the trigram tokenizer, so LIKE '%...%' substring
+    patterns on its columns are answered from the index. When it is first
+    added to an existing database (or replaces the earlier word-tokenized
+    index) it is built from the rows already cataloged.
+    """
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'files_fts'")
+    row = cursor.fetchone()
+    exists = row is not None and "trigram" in row[0]
+    if row is not None and not exists:
+        cursor.execute("DROP TABLE files_fts")
+    
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+        filename,
+        path,
+        content='files',
+        content_rowid='rowid',
+        tokenize='trigram'
+    )
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS files_fts_insert AFTER INSERT ON files BEGIN
+        INSERT INTO files_fts (rowid, filename, path) VALUES (new.rowid, new.filename, new.path);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS files_fts_delete AFTER DELETE ON files BEGIN
+        INSERT INTO files_fts (files_fts, rowid, filename, path) VALUES ('delete', old.rowid, old.filename, old.path);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS files_fts_update AFTER UPDATE OF filename, path ON files BEGIN
+        INSERT INTO files_fts (files_fts, rowid, filename, path) VALUES ('delete', old.rowid, old.filename, old.path);
+        INSERT INTO files_fts (rowid, filename, path) VALUES (new.rowid, new.filename, new.path);
+    END
+    ''')
+    
+    if not exists:
+        cursor.execute("INSERT INTO files_fts (files_fts) VALUES ('rebuild')")
+
+def has_files_fts(cursor):
+    """
+    Check for the trigram files_fts index
+    
+    init_db and catalog_files create it; searches only look for it, and fall
+    back to LIKE on the files table for a database that predates it.
+    """
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'files_fts'")
+    row = cursor.fetchone()
+    return row is not None and "trigram" in row[0]
+
+def create_project_file_counts(cursor):
+    """
+    Add projects.file_count and the triggers that keep it in step with project_files
+    
+    The project list shows how many files each project holds; reading a stored
+    count avoids aggregating project_files on every view. The column is filled
+    from the existing mappings when it is first added.
+    """
+    cursor.execute("PRAGMA table_info(projects)")
+    column_names = [column[1] for column in cursor.fetchall()]
+    
+    if 'file_count' not in column_names:
+        cursor.execute("ALTER TABLE projects ADD COLUMN file_count INTEGER NOT NULL DEFAULT 0")
+        cursor.execute('''
+        UPDATE projects SET file_count = (
+            SELECT COUNT(*) FROM project_files WHERE project_files.project_id = projects.id
+        )
+        ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS project_files_count_insert AFTER INSERT ON project_files BEGIN
+        UPDATE projects SET file_count = file_count + 1 WHERE id = new.project_id;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS project_files_count_delete AFTER DELETE ON project_files BEGIN
+        UPDATE projects SET file_count = file_count - 1 WHERE id = old.project_id;
+    END
+    ''')
+
+def get_cached_media_info(file_path, file_stats, cursor):
+    """
+    Return the stored ffprobe output for a file if the file is unchanged
+    
+    Results are kept in the probe_cache table keyed on the file path and
+    validated against its size and modification time, so re-cataloging a drive
+    only spawns ffprobe for new or modified media.
+    
+    Args:
+        file_path: Path to the media file
+        file_stats: os.stat result for the file
+        cursor: Database cursor used for the cache lookup
+        
+    Returns:
+        ffprobe JSON output or None if the file has not been probed
+    """
+    cursor.execute(
+        "SELECT size_bytes, mtime_ns, media_info FROM probe_cache WHERE path = ?",
+        (file_path,)
+    )
+    cached = cursor.fetchone()
+    if cached and cached[0] == file_stats.st_size and cached[1] == file_stats.st_mtime_ns:
+        return cached[2]
+    return None
+
+def probe_media_file(file_path, media_info=None, thumbnail_dir=None):
+    """
+    Run ffprobe on a media file and optionally generate a video thumbnail
+    
+    Args:
+        file_path: Path to the media file
+        media_info: Known ffprobe output (skips the ffprobe call)
+        thumbnail_dir: Directory for a video thumbnail, or None for no thumbnail
+        
+    Returns:
+        (media_info, thumbnail_path) tuple; either may be None
+    """
+    if media_info is None:
+        media_info = get_media_info(file_path)
+    
+    thumbnail_path = None
+    if thumbnail_dir:
+        # Reuse the duration from the ffprobe output rather than probing the
+        # file a second time for the midpoint
+        duration = None
+        if media_info:
+            try:
+                duration = float(json.loads(media_info)["format"]["duration"])
+            except (ValueError, KeyError, TypeError):
+                pass
+        thumbnail_path = generate_video_thumbnail(file_path, thumbnail_dir, duration=duration)
+    
+    return media_info, thumbnail_path
+
+def generate_video_thumbnail(video_path, output_dir=None, width=640, height=480, duration=None):
     """
     Generate a thumbnail from a video file by extracting a frame from the middle
     
@@ -444,6 +611,7 @@ def generate_video_thumbnail(video_path, output_dir=None, width=640, height=480)
         output_dir: Directory to save thumbnail (defaults to media-asset-tracker/thumbnails)
         width: Thumbnail width
         height: Thumbnail height
+        duration: Video duration in seconds, if already known (skips the ffprobe call)
         
     Returns:
         Path to the generated thumbnail or None if failed
@@ -453,7 +621,6 @@ def generate_video_thumbnail(video_path, output_dir=None, width=640, height=480)
         if video_path.lower().endswith('.r3d'):
             # R3D files are typically in an RDC folder structure with multiple chunks
             # We only want one thumbnail per RDC folder (logical clip)
-            import glob
             
             # Extract the parent directory structure
             file_dir = os.path.dirname(video_path)
@@ -478,12 +645,12 @@ def generate_video_thumbnail(video_path, output_dir=None, width=640, height=480)
                     output_dir = os.path.expanduser("~/media-asset-tracker/thumbnails")
                 
                 os.makedirs(output_dir, exist_ok=True)
-                existing_thumbs = glob.glob(os.path.join(output_dir, f"{rdc_key}_*.jpg"))
+                existing_thumb = os.path.join(output_dir, f"{rdc_key}.jpg")
                 
-                if existing_thumbs:
+                if os.path.exists(existing_thumb):
                     print(f"Found existing thumbnail for RDC folder: {rdc_dir}")
                     # Return the existing thumbnail
-                    return existing_thumbs[0]
+                    return existing_thumb
                 
                 # If we're here, we need to generate a new thumbnail
                 print(f"Generating new thumbnail for RDC folder: {rdc_dir}")
@@ -492,33 +659,28 @@ def generate_video_thumbnail(video_path, output_dir=None, width=640, height=480)
                 # Standard R3D file not in RDC structure
                 return generate_r3d_thumbnail(video_path, output_dir, width, height)
             
-        # For other video formats, use ffmpeg
-        # Check if ffmpeg is available
-        subprocess.run(
-            ["ffmpeg", "-version"], 
-            capture_output=True, 
-            check=True
-        )
-        
-        # Get video duration using ffprobe
-        duration_result = subprocess.run(
-            [
-                "ffprobe", 
-                "-v", "error", 
-                "-show_entries", "format=duration", 
-                "-of", "default=noprint_wrappers=1:nokey=1", 
-                video_path
-            ],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        try:
-            duration = float(duration_result.stdout.strip())
-        except (ValueError, TypeError):
-            # If duration cannot be determined, assume 30 seconds
-            duration = 30.0
+        # For other video formats, use ffmpeg (a missing ffmpeg surfaces as
+        # FileNotFoundError from the extraction below)
+        if duration is None:
+            # Get video duration using ffprobe
+            duration_result = subprocess.run(
+                [
+                    "ffprobe", 
+                    "-v", "error", 
+                    "-show_entries", "format=duration", 
+                    "-of", "default=noprint_wrappers=1:nokey=1", 
+                    video_path
+                ],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            
+            try:
+                duration = float(duration_result.stdout.strip())
+            except (ValueError, TypeError):
+                # If duration cannot be determined, assume 30 seconds
+                duration = 30.0
         
         # Calculate the middle point
         middle_time = duration / 2
@@ -539,14 +701,20 @@ def generate_video_thumbnail(video_path, output_dir=None, width=640, height=480)
             [
                 "ffmpeg", 
                 "-y",  # Overwrite output files
-                "-ss", str(middle_time),  # Seek to middle position
+                "-ss", str(middle_time),  # Seek to middle position (input seek, before -i)
+                "-noaccurate_seek",  # Take the keyframe at or before it instead of decoding up to the exact time
                 "-i", video_path,  # Input file
                 "-vframes", "1",  # Extract one frame
                 "-q:v", "2",  # Quality (2 is high, 31 is low)
                 "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",  # Scale and pad
                 thumbnail_path  # Output file
             ],
-            capture_output=True,
+            # ffmpeg's log is only kept for the error message; stdin is detached so it
+            # can't read the terminal, and close_fds=False lets Python use posix_spawn
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            close_fds=False,
             check=True
         )
         
@@ -598,8 +766,10 @@ def generate_r3d_thumbnail(r3d_path, output_dir=None, width=640, height=480, rdc
         
         # Generate thumbnail filename - use RDC key if provided
         if rdc_key:
-            # Use RDC folder key to identify the clip rather than individual R3D file
-            thumbnail_name = f"{rdc_key}_{uuid.uuid4().hex[:8]}.jpg"
+            # Use RDC folder key to identify the clip rather than individual R3D file.
+            # The name is fixed so an existing clip thumbnail is found with a single
+            # stat instead of a pattern scan of the whole thumbnails directory.
+            thumbnail_name = f"{rdc_key}.jpg"
             print(f"Using RDC-based thumbnail name: {thumbnail_name}")
         else:
             # Use individual file name
@@ -718,7 +888,10 @@ def generate_r3d_thumbnail(r3d_path, output_dir=None, width=640, height=480, rdc
                         "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",  # Scale and pad
                         thumbnail_path  # Output file
                     ],
-                    capture_output=True,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    close_fds=False,
                     check=True,
                     timeout=60  # Add timeout to avoid hanging
                 )
@@ -743,7 +916,10 @@ def generate_r3d_thumbnail(r3d_path, output_dir=None, width=640, height=480, rdc
                         "-vframes", "1",  # Extract one frame
                         thumbnail_path  # Output file
                     ],
-                    capture_output=True,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    close_fds=False,
                     check=True,
                     timeout=60  # Add timeout to avoid hanging
                 )
@@ -767,7 +943,10 @@ def generate_r3d_thumbnail(r3d_path, output_dir=None, width=640, height=480, rdc
                         "-vframes", "1",  # Extract one frame
                         thumbnail_path  # Output file
                     ],
-                    capture_output=True,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    close_fds=False,
                     check=True,
                     timeout=60  # Add timeout to avoid hanging
                 )
@@ -1016,7 +1195,10 @@ def generate_video_thumbnail_with_ffmpeg(video_path, output_dir, width, height):
                 "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",  # Scale and pad
                 thumbnail_path  # Output file
             ],
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            close_fds=False,
             check=True
         )
         
@@ -1025,6 +1207,38 @@ def generate_video_thumbnail_with_ffmpeg(video_path, output_dir, width, height):
         print(f"Fallback thumbnail generation failed: {e}")
         return None
 
+def scan_files(root):
+    """
+    Yield a DirEntry for every file below root.
+    
+    Walks the tree with os.scandir so each entry's stat can be reused by the
+    caller. Hidden directories and Final Cut Pro bundle/cache directories are
+    not descended into, and symlinked directories are not followed.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except OSError:
+        return
+    
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        
+        if not is_dir:
+            yield entry
+        elif not (entry.is_symlink() or entry.name.startswith('.') or
+                  entry.name.endswith('.fcpbundle') or '.fcpcache' in entry.name):
+            yield from scan_files(entry.path)
+
+# Checksums read whole files from the drive being cataloged; more than a
+# couple of readers at once only makes a spinning disk seek between them
+CHECKSUM_WORKERS = 2
+# Checksum jobs queued ahead of the walk before it waits for one to finish
+MAX_PENDING_CHECKSUMS = 64
+
 def catalog_files(drive_info, conn=None):
     """Catalog all files on the drive and store in database"""
     # Check if drive_info is None (operation cancelled during duplicate handling)
@@ -1033,10 +1247,10 @@ def catalog_files(drive_info, conn=None):
         return 0
         
     if conn is None:
-        # Set timeout to 60 seconds and enable WAL mode for better concurrency
-        conn = sqlite3.connect(DB_PATH, timeout=60.0)
-        conn.execute('PRAGMA journal_mode=WAL')
+        conn = get_db_connection()
     cursor = conn.cursor()
+    create_probe_cache_table(cursor)
+    create_files_fts_table(cursor)
     
     print("\n=== CATALOGING PROCESS STARTED ===")
     print(f"Drive: {drive_info['volume_name']}")
@@ -1078,6 +1292,31 @@ def catalog_files(drive_info, conn=None):
     # Track RDC folders that have already had thumbnails generated
     processed_rdc_folders = {}  # Maps RDC folder keys to thumbnail paths
     
+    # ffprobe runs and ffmpeg thumbnails are independent subprocesses, so they
+    # run on a thread pool while the walk continues. The database rows are
+    # updated from this thread once the walk is done.
+    media_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+    media_jobs = {}  # Maps futures to (file ID, relative path, probe cache key)
+    
+    # Checksums go to a separate, small thread pool (file_digest and large
+    # update() calls hash without holding the GIL). Finished checksums are
+    # written with each batch of file rows, so an interrupted run keeps them.
+    checksum_executor = ThreadPoolExecutor(max_workers=CHECKSUM_WORKERS)
+    checksum_jobs = {}  # Maps futures to (file ID, relative path)
+    checksum_updates = []
+    
+    def collect_checksums(futures):
+        """Move finished checksum jobs into checksum_updates"""
+        for future in futures:
+            file_id, rel_path = checksum_jobs.pop(future)
+            try:
+                checksum = future.result()
+            except Exception as e:
+                print(f"\nError calculating checksum for {rel_path}: {e}")
+                continue
+            if checksum:
+                checksum_updates.append((checksum, file_id))
+    
     # Function to update multiple files with the same thumbnail (for RDC folders)
     def update_thumbnails_for_rdc_files(file_ids, thumbnail_path, cursor):
         """Update multiple files in the database with the same thumbnail path"""
@@ -1106,11 +1345,7 @@ def catalog_files(drive_info, conn=None):
     
     # Count total files for progress reporting
     print("\nCounting files (initial scan)...")
-    file_count = 0
-    for root, dirs, files in os.walk(drive_info["mount_point"]):
-        file_count += len(files)
-        # Remove hidden directories to speed up scan
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
+    file_count = sum(1 for _ in scan_files(drive_info["mount_point"]))
     print(f"Found approximately {file_count} files to process")
     
     # Progress tracking
@@ -1121,235 +1356,327 @@ def catalog_files(drive_info, conn=None):
     last_update = datetime.datetime.now()
     update_interval = datetime.timedelta(seconds=1)  # Update every second
     
-    for root, dirs, files in os.walk(mount_point):
-        # Skip hidden directories and Final Cut Pro bundle internals
-        dirs[:] = [d for d in dirs if not d.startswith('.') and not (d.endswith('.fcpbundle') or '.fcpcache' in d)]
-        
-        # Skip .fcpbundle bundle internals if we're already inside one 
-        if '.fcpbundle/' in root or '.fcpcache/' in root:
-            continue
-        
-        current_dir = os.path.relpath(root, mount_point)
-        if current_dir == ".":
-            current_dir = "/"
+    # Files from a previous catalog of this drive keep their row ID, and their
+    # checksum too when the size and modification time are unchanged
+    cursor.execute(
+        "SELECT path, id, size_bytes, date_modified, checksum FROM files WHERE drive_id = ?",
+        (drive_info["id"],)
+    )
+    existing_files = {row[0]: row[1:] for row in cursor.fetchall()}
+    
+    insert_file_sql = '''
+    INSERT INTO files (
+        id, drive_id, path, filename, extension, size_bytes, 
+        date_created, date_modified, checksum, mime_type, media_info,
+        thumbnail_path, transcription_status
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        path = excluded.path,
+        filename = excluded.filename,
+        extension = excluded.extension,
+        date_created = excluded.date_created,
+        checksum = excluded.checksum,
+        mime_type = excluded.mime_type,
+        media_info = excluded.media_info,
+        thumbnail_path = COALESCE(excluded.thumbnail_path, files.thumbnail_path),
+        transcription_status = CASE
+            WHEN files.size_bytes = excluded.size_bytes AND files.date_modified = excluded.date_modified
+            THEN files.transcription_status
+            ELSE excluded.transcription_status
+        END,
+        size_bytes = excluded.size_bytes,
+        date_modified = excluded.date_modified
+    '''
+    file_rows = []
+    # scandir entry paths all start with the mount point plus a separator, so
+    # relative paths are a slice rather than an os.path.relpath call per file
+    mount_prefix_len = len(os.path.join(mount_point, ""))
+    mime_types = {}  # Maps suffixes to (MIME type, top-level type) already guessed
+    
+    for entry in scan_files(mount_point):
+        filename = entry.name
+        file_path = entry.path
+        rel_path = file_path[mount_prefix_len:]
         
         # Show current directory less frequently
         now = datetime.datetime.now()
         if now - last_update > update_interval:
+            current_dir = os.path.dirname(rel_path) or "/"
             print(f"\rProcessing directory: {current_dir:<60}", end="", flush=True)
             last_update = now
         
-        for filename in files:
-            file_path = os.path.join(root, filename)
-            rel_path = os.path.relpath(file_path, mount_point)
+        # Skip system files (hidden and Final Cut Pro bundle directories are
+        # already pruned by scan_files, so only the name needs checking)
+        if filename.startswith('.'):
+            skipped_count += 1
+            continue
             
-            # Skip system files and Final Cut Pro internal files
-            if any(part.startswith('.') for part in rel_path.split(os.path.sep)) or '.fcpbundle/' in rel_path or '.fcpcache/' in rel_path:
-                skipped_count += 1
-                continue
+        try:
+            # Get file stats
+            file_stats = entry.stat()
+            file_size = file_stats.st_size
+            total_size += file_size
+            file_created = datetime.datetime.fromtimestamp(file_stats.st_ctime).isoformat()
+            file_modified = datetime.datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+            
+            # Get file extension and MIME type
+            stem, dot, extension = filename.rpartition('.')
+            extension = extension.lower() if stem else ""
+            
+            # Update file type statistics
+            if extension in file_types:
+                file_types[extension]["count"] += 1
+                file_types[extension]["size"] += file_size
+            else:
+                file_types[extension] = {"count": 1, "size": file_size}
+            
+            # Check specifically for .r3d files and track RDC folders
+            is_r3d = extension.lower() == 'r3d'
+            if is_r3d:
+                r3d_count += 1
                 
-            try:
-                # Get file stats
-                file_stats = os.stat(file_path)
-                file_size = file_stats.st_size
-                total_size += file_size
-                file_created = datetime.datetime.fromtimestamp(file_stats.st_ctime).isoformat()
-                file_modified = datetime.datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+                # Get a more robust RDC folder key
+                rdc_key = None
                 
-                # Get file extension and MIME type
-                _, extension = os.path.splitext(filename)
-                extension = extension.lower().lstrip('.')
+                # Check if this is in an RDC folder structure
+                file_dir = os.path.dirname(file_path)
+                is_rdc = False
                 
-                # Update file type statistics
-                if extension in file_types:
-                    file_types[extension]["count"] += 1
-                    file_types[extension]["size"] += file_size
+                # Look for RDC folder in path parts
+                path_parts = os.path.normpath(file_dir).split(os.sep)
+                for part in path_parts:
+                    if part.upper() == "RDC" or part.upper().endswith(".RDC"):
+                        is_rdc = True
+                        # Extract clip prefix from filename for more precise grouping
+                        file_name = os.path.basename(file_path)
+                        clip_match = re.match(r'^([A-Z]\d{3}_[A-Z]\d{3}).*\.[Rr]3[Dd]$', file_name)
+                        
+                        # Build a key that combines RDC folder and clip prefix when available
+                        if clip_match:
+                            clip_prefix = clip_match.group(1)  # e.g., A001_C001
+                            rdc_key = f"{part}_{clip_prefix}"
+                        else:
+                            # Fall back to RDC folder name if no clip pattern found
+                            rdc_key = part
+                            
+                        break
+                        
+                if is_rdc:
+                    # This is in an RDC folder - process all chunks as one logical clip
+                    # Record files from this RDC folder for batch updating
+                    if r3d_count % 10 == 0 or "001.R3D" in file_path.upper():
+                        print(f"\nProcessed {r3d_count} R3D files so far.")
+                        print(f"RDC folder: {file_dir} (key: {rdc_key})")
+                        print(f"File in clip: {rel_path}")
+                else:
+                    # Not in an RDC structure, just a regular R3D file
+                    # Print a message every 10 r3d files
+                    if r3d_count % 10 == 0:
+                        print(f"\nProcessed {r3d_count} R3D files so far. Current: {rel_path}")
+            
+            # Determine MIME type with special handling for R3D files
+            if is_r3d:
+                mime_type, media_kind = "video/x-red-r3d", "video"
+            else:
+                # A compression suffix is typed by the suffix before it
+                # (.tar.gz is a tar archive), so both are part of the key
+                mime_key = f".{extension}"
+                if mime_key in mimetypes.encodings_map:
+                    mime_key = "".join(Path(filename).suffixes[-2:]).lower()
+                cached_type = mime_types.get(mime_key)
+                if cached_type is None:
+                    mime_type = mimetypes.guess_type(f"file{mime_key}")[0] or "application/octet-stream"
+                    # Keep the top-level type ("video", "audio", ...) with it
+                    cached_type = mime_types[mime_key] = (mime_type, mime_type.partition("/")[0])
+                mime_type, media_kind = cached_type
+            
+            existing = existing_files.get(rel_path)
+            file_id = existing[0] if existing else str(uuid.uuid4())
+            
+            # Calculate checksum for small to medium files
+            checksum = None
+            if existing and existing[1] == file_size and existing[2] == file_modified:
+                checksum = existing[3]
+            if checksum is None and file_size < 500_000_000:  # Skip files larger than 500MB
+                if len(checksum_jobs) >= MAX_PENDING_CHECKSUMS:
+                    done, _ = wait(checksum_jobs, return_when=FIRST_COMPLETED)
+                    collect_checksums(done)
+                future = checksum_executor.submit(calculate_checksum, file_path)
+                checksum_jobs[future] = (file_id, rel_path)
+            
+            # Extract media info and generate thumbnail for video files
+            media_info = None
+            thumbnail_path = None
+            
+            # Process any video file (including .r3d)
+            if media_kind == "video":
+                # Handle media info extraction first - different approach for R3D files
+                if is_r3d:
+                    # For .r3d files, don't try to extract media info with ffprobe as it can be problematic
+                    # Instead, store basic file info
+                    media_info = json.dumps({
+                        "format": {
+                            "filename": file_path,
+                            "format_name": "r3d",
+                            "size": str(file_size)
+                        },
+                        "streams": [
+                            {
+                                "codec_type": "video",
+                                "codec_name": "r3d"
+                            }
+                        ]
+                    })
+                    print(f"\nStored basic info for R3D file: {rel_path}")
                 else:
-                    file_types[extension] = {"count": 1, "size": file_size}
+                    # For other video files, use the cached ffprobe output if
+                    # any; otherwise ffprobe runs with the thumbnail below
+                    media_info = get_cached_media_info(file_path, file_stats, cursor)
+                
+                # Generate thumbnail from video
+                thumbnail_dir = os.path.expanduser(f"~/media-asset-tracker/thumbnails/{drive_info['id']}")
                 
-                # Check specifically for .r3d files and track RDC folders
-                is_r3d = extension.lower() == 'r3d'
+                # Use R3D-specific handling for .r3d files
                 if is_r3d:
-                    r3d_count += 1
-                    
-                    # Get a more robust RDC folder key
-                    rdc_key = None
-                    rdc_file_id = str(uuid.uuid4())  # Generate file ID here for potential batch updates
-                    
-                    # Check if this is in an RDC folder structure
-                    file_dir = os.path.dirname(file_path)
-                    is_rdc = False
-                    
-                    # Look for RDC folder in path parts
-                    path_parts = os.path.normpath(file_dir).split(os.sep)
-                    for part in path_parts:
-                        if part.upper() == "RDC" or part.upper().endswith(".RDC"):
-                            is_rdc = True
-                            # Extract clip prefix from filename for more precise grouping
-                            file_name = os.path.basename(file_path)
-                            clip_match = re.match(r'^([A-Z]\d{3}_[A-Z]\d{3}).*\.[Rr]3[Dd]$', file_name)$', file_name)
+                    # Use the previously detected RDC key
+                    if is_rdc and rdc_key:
+                        # Check if we've already processed this RDC folder
+                        if rdc_key in processed_rdc_folders:
+                            # Reuse the existing thumbnail
+                            print(f"Reusing existing thumbnail for RDC folder: {rdc_key}")
+                            thumbnail_path = processed_rdc_folders[rdc_key]
+                        else:
+                            # Generate new thumbnail for this RDC folder
+                            print(f"Generating thumbnail for RDC folder: {rdc_key}")
                             
-                            # Build a key that combines RDC folder and clip prefix when available
-                            if clip_match:
-                                clip_prefix = clip_match.group(1)  # e.g., A001_C001
-                                rdc_key = f"{part}_{clip_prefix}"
+                            # Try to select a representative file (middle file in sequence)
+                            # This matches the behavior in redline_single_frame.py
+                            file_name = os.path.basename(file_path)
+                            if "001.R3D" in file_name.upper() and not "_C001_" in file_name.upper():
+                                # This is likely the first file, store but don't generate yet
+                                processed_rdc_folders[rdc_key] = "PENDING"
+                                thumbnail_path = None
+                            elif processed_rdc_folders.get(rdc_key) == "PENDING":
+                                # Generate thumbnail from this file (not the first)
+                                thumbnail_path = generate_r3d_thumbnail(file_path, thumbnail_dir, rdc_key=rdc_key)
+                                if thumbnail_path:
+                                    processed_rdc_folders[rdc_key] = thumbnail_path
                             else:
-                                # Fall back to RDC folder name if no clip pattern found
-                                rdc_key = part
-                                
-                            break
-                            
-                    if is_rdc:
-                        # This is in an RDC folder - process all chunks as one logical clip
-                        # Record files from this RDC folder for batch updating
-                        if r3d_count % 10 == 0 or "001.R3D" in file_path.upper():
-                            print(f"\nProcessed {r3d_count} R3D files so far.")
-                            print(f"RDC folder: {file_dir} (key: {rdc_key})")
-                            print(f"File in clip: {rel_path}")
+                                # Some other file in the RDC folder
+                                thumbnail_path = generate_r3d_thumbnail(file_path, thumbnail_dir, rdc_key=rdc_key)
+                                if thumbnail_path:
+                                    processed_rdc_folders[rdc_key] = thumbnail_path
                     else:
-                        # Not in an RDC structure, just a regular R3D file
-                        # Print a message every 10 r3d files
-                        if r3d_count % 10 == 0:
-                            print(f"\nProcessed {r3d_count} R3D files so far. Current: {rel_path}")
-                
-                # Determine MIME type with special handling for R3D files
-                if is_r3d:
-                    mime_type = "video/x-red-r3d"
+                        # Not in an RDC folder, process normally
+                        thumbnail_path = generate_r3d_thumbnail(file_path, thumbnail_dir)
                 else:
-                    mime_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
-                
-                # Calculate checksum for small to medium files
-                checksum = None
-                if file_size < 500_000_000:  # Skip files larger than 500MB
-                    checksum = calculate_checksum(file_path)
-                
-                # Extract media info and generate thumbnail for video files
-                media_info = None
-                thumbnail_path = None
-                
-                # Process any video file (including .r3d)
-                if is_r3d or (mime_type and mime_type.startswith("video/")):
-                    # Handle media info extraction first - different approach for R3D files
-                    if is_r3d:
-                        # For .r3d files, don't try to extract media info with ffprobe as it can be problematic
-                        # Instead, store basic file info
-                        media_info = json.dumps({
-                            "format": {
-                                "filename": file_path,
-                                "format_name": "r3d",
-                                "size": str(file_size)
-                            },
-                            "streams": [
-                                {
-                                    "codec_type": "video",
-                                    "codec_name": "r3d"
-                                }
-                            ]
-                        })
-                        print(f"\nStored basic info for R3D file: {rel_path}")
-                    else:
-                        # For other video files, try normal media info extraction
-                        media_info = get_media_info(file_path)
-                        if media_info:
-                            print(f"\nExtracted media info for: {rel_path}")
+                    # Generated in the background; the row is updated after the walk
+                    future = media_executor.submit(probe_media_file, file_path, media_info, thumbnail_dir)
+                    probe_key = None if media_info else (file_path, file_stats.st_size, file_stats.st_mtime_ns)
+                    media_jobs[future] = (file_id, rel_path, probe_key)
                     
-                    # Generate thumbnail from video
-                    thumbnail_dir = os.path.expanduser(f"~/media-asset-tracker/thumbnails/{drive_info['id']}")
-                    
-                    # Use R3D-specific handling for .r3d files
-                    if is_r3d:
-                        # Use the previously detected RDC key
-                        if is_rdc and rdc_key:
-                            # Check if we've already processed this RDC folder
-                            if rdc_key in processed_rdc_folders:
-                                # Reuse the existing thumbnail
-                                print(f"Reusing existing thumbnail for RDC folder: {rdc_key}")
-                                thumbnail_path = processed_rdc_folders[rdc_key]
-                            else:
-                                # Generate new thumbnail for this RDC folder
-                                print(f"Generating thumbnail for RDC folder: {rdc_key}")
-                                
-                                # Try to select a representative file (middle file in sequence)
-                                # This matches the behavior in redline_single_frame.py
-                                file_name = os.path.basename(file_path)
-                                if "001.R3D" in file_name.upper() and not "_C001_" in file_name.upper():
-                                    # This is likely the first file, store but don't generate yet
-                                    processed_rdc_folders[rdc_key] = "PENDING"
-                                    thumbnail_path = None
-                                elif processed_rdc_folders.get(rdc_key) == "PENDING":
-                                    # Generate thumbnail from this file (not the first)
-                                    thumbnail_path = generate_r3d_thumbnail(file_path, thumbnail_dir, rdc_key=rdc_key)
-                                    if thumbnail_path:
-                                        processed_rdc_folders[rdc_key] = thumbnail_path
-                                else:
-                                    # Some other file in the RDC folder
-                                    thumbnail_path = generate_r3d_thumbnail(file_path, thumbnail_dir, rdc_key=rdc_key)
-                                    if thumbnail_path:
-                                        processed_rdc_folders[rdc_key] = thumbnail_path
-                        else:
-                            # Not in an RDC folder, process normally
-                            thumbnail_path = generate_r3d_thumbnail(file_path, thumbnail_dir)
-                    else:
-                        thumbnail_path = generate_video_thumbnail(file_path, thumbnail_dir)
-                        
+                if thumbnail_path:
+                    print(f"\nGenerated thumbnail for: {rel_path}")
+            
+            # Extract media info for audio files
+            elif media_kind == "audio":
+                media_info = get_cached_media_info(file_path, file_stats, cursor)
+                if media_info is None:
+                    future = media_executor.submit(probe_media_file, file_path)
+                    media_jobs[future] = (file_id, rel_path, (file_path, file_stats.st_size, file_stats.st_mtime_ns))
+            
+            # For .r3d files in RDC folders, use the RDC folder's thumbnail
+            if is_r3d and is_rdc and rdc_key and rdc_key in processed_rdc_folders:
+                if processed_rdc_folders[rdc_key] != "PENDING":
+                    # Update thumbnail path from the RDC folder's cached thumbnail
+                    thumbnail_path = processed_rdc_folders[rdc_key]
                     if thumbnail_path:
-                        print(f"\nGenerated thumbnail for: {rel_path}")
-                
-                # Extract media info for audio files
-                elif mime_type and mime_type.startswith("audio/"):
-                    media_info = get_media_info(file_path)
-                    if media_info:
-                        print(f"\nExtracted media info for: {rel_path}")
-                
-                # For .r3d files in RDC folders, use the RDC folder's thumbnail
-                if is_r3d and is_rdc and rdc_key and rdc_key in processed_rdc_folders:
-                    if processed_rdc_folders[rdc_key] != "PENDING":
-                        # Update thumbnail path from the RDC folder's cached thumbnail
-                        thumbnail_path = processed_rdc_folders[rdc_key]
-                        if thumbnail_path:
-                            print(f"Using shared RDC folder thumbnail for: {rel_path}")
-                
-                # Store file info in database without transcription (will be processed later)
-                cursor.execute('''
-                INSERT OR REPLACE INTO files (
-                    id, drive_id, path, filename, extension, size_bytes, 
-                    date_created, date_modified, checksum, mime_type, media_info,
-                    thumbnail_path, transcription_status
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    str(uuid.uuid4()),
-                    drive_info["id"],
-                    rel_path,
-                    filename,
-                    extension,
-                    file_size,
-                    file_created,
-                    file_modified,
-                    checksum,
-                    mime_type,
-                    media_info,
-                    thumbnail_path,
-                    "pending" if (mime_type and (mime_type.startswith("video/") or mime_type.startswith("audio/"))) else None
-                ))
-                
-                total_files += 1
-                
-                # Update progress every 100 files
-                if total_files % 100 == 0:
-                    progress = total_files / file_count * 100 if file_count > 0 else 0
-                    elapsed = (datetime.datetime.now() - start_time).total_seconds()
-                    files_per_sec = total_files / elapsed if elapsed > 0 else 0
-                    
-                    # Clear previous line and print updated progress
-                    print(f"\rProgress: {total_files}/{file_count} files ({progress:.1f}%) | {files_per_sec:.1f} files/sec | {total_size/(1024**3):.2f} GB indexed", end="", flush=True)
-                
-                # Commit more frequently for large file collections to reduce locking
-                if total_files % 100 == 0:
-                    conn.commit()
+                        print(f"Using shared RDC folder thumbnail for: {rel_path}")
+            
+            # Store file info in database without transcription (will be processed later)
+            file_rows.append((
+                file_id,
+                drive_info["id"],
+                rel_path,
+                filename,
+                extension,
+                file_size,
+                file_created,
+                file_modified,
+                checksum,
+                mime_type,
+                media_info,
+                thumbnail_path,
+                "pending" if media_kind in ("video", "audio") else None
+            ))
+            
+            total_files += 1
+            
+            # Update progress every 100 files
+            if total_files % 100 == 0:
+                progress = total_files / file_count * 100 if file_count > 0 else 0
+                elapsed = (datetime.datetime.now() - start_time).total_seconds()
+                files_per_sec = total_files / elapsed if elapsed > 0 else 0
                 
-            except Exception as e:
-                error_count += 1
-                print(f"\nError processing file {rel_path}: {e}")
+                # Clear previous line and print updated progress
+                print(f"\rProgress: {total_files}/{file_count} files ({progress:.1f}%) | {files_per_sec:.1f} files/sec | {total_size/(1024**3):.2f} GB indexed", end="", flush=True)
+            
+        except Exception as e:
+            error_count += 1
+            print(f"\nError processing file {rel_path}: {e}")
+        
+        # Write rows in batches, committing each to keep lock times short
+        if len(file_rows) >= 1000:
+            cursor.executemany(insert_file_sql, file_rows)
+            collect_checksums([future for future in checksum_jobs if future.done()])
+            if checksum_updates:
+                cursor.executemany("UPDATE files SET checksum = ? WHERE id = ?", checksum_updates)
+                checksum_updates.clear()
+            conn.commit()
+            file_rows.clear()
+    
+    if file_rows:
+        cursor.executemany(insert_file_sql, file_rows)
+
+    # Collect the background ffprobe output and video thumbnails
+    if media_jobs:
+        print(f"\nWaiting for {len(media_jobs)} media files...")
+    media_updates = []
+    probe_cache_rows = []
+    thumbnail_updates = []
+    for future in as_completed(media_jobs):
+        file_id, rel_path, probe_key = media_jobs[future]
+        try:
+            media_info, thumbnail_path = future.result()
+        except Exception as e:
+            print(f"\nError processing media file {rel_path}: {e}")
+            continue
+        if probe_key and media_info:
+            media_updates.append((media_info, file_id))
+            probe_cache_rows.append(probe_key + (media_info,))
+            print(f"\nExtracted media info for: {rel_path}")
+        if thumbnail_path:
+            thumbnail_updates.append((thumbnail_path, file_id))
+            print(f"\nGenerated thumbnail for: {rel_path}")
+    media_executor.shutdown()
+    
+    if media_updates:
+        cursor.executemany("UPDATE files SET media_info = ? WHERE id = ?", media_updates)
+        cursor.executemany(
+            "INSERT OR REPLACE INTO probe_cache (path, size_bytes, mtime_ns, media_info) VALUES (?, ?, ?, ?)",
+            probe_cache_rows
+        )
+    if thumbnail_updates:
+        cursor.executemany("UPDATE files SET thumbnail_path = ? WHERE id = ?", thumbnail_updates)
+    
+    # Collect the checksums still running
+    if checksum_jobs:
+        print(f"\nWaiting for {len(checksum_jobs)} checksums...")
+    collect_checksums(as_completed(list(checksum_jobs)))
+    checksum_executor.shutdown()
+    
+    if checksum_updates:
+        cursor.executemany("UPDATE files SET checksum = ? WHERE id = ?", checksum_updates)
     
     # Final commit
     conn.commit()
@@ -1403,47 +1730,49 @@ def catalog_files(drive_info, conn=None):
     print("\nCataloging complete!")
     return total_files
 
-def generate_qr_code(drive_info, label=None):
-    """Generate a QR code with drive information for printing"""
-    qr_data = {
-        "drive_id": drive_info["id"],
-        "volume_name": drive_info["volume_name"],
-        "size_gb": round(drive_info["size_bytes"] / (1024**3), 2),
-        "date_cataloged": drive_info["date_cataloged"]
-    }
-    
-    if label:
-        qr_data["label"] = label
-        drive_info["label"] = label
-    
-    # Generate QR code
+def render_qr_image(payload, box_size=10, border=4):
+    """Render a QR code for a payload string as a PIL image"""
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_H,
-        box_size=10,
-        border=4,
+        box_size=box_size,
+        border=border,
     )
-    qr.add_data(json.dumps(qr_data))
+    qr.add_data(payload)
     qr.make(fit=True)
     
     # Create QR code image
     img = qr.make_image(fill_color="black", back_color="white")
     
-    # Add label text below QR code
-    label_text = label or drive_info["volume_name"]
-    
     # Convert the QR code to a PIL Image if it's not already
     if not isinstance(img, Image.Image):
         print("Converting QR code to PIL Image")
         img_data = img.get_image()
         if hasattr(img_data, 'convert'):
-            img = img_data.convert('RGB')
+            img = img_data.convert('L')
         else:
             # If we can't get a proper Image object, create a new one from scratch
             print("Creating new QR code image from scratch")
             qr.make()
             img = qr.make_image(fill_color="black", back_color="white").get_image()
     
+    return img
+
+@lru_cache(maxsize=32)
+def get_default_font(size):
+    """Load the label font at the given size, falling back to PIL's built-in font"""
+    for font_name in ("Arial", "DejaVuSans.ttf"):
+        try:
+            return ImageFont.truetype(font_name, size)
+        except IOError:
+            continue
+    return ImageFont.load_default()
+
+def render_label_image(payload, label_text):
+    """Compose a printable label: the QR code for a payload with its text below"""
+    # Generate QR code
+    img = render_qr_image(payload)
+    
     # Get the size of the image
     try:
         width, height = img.size
@@ -1453,8 +1782,9 @@ def generate_qr_code(drive_info, label=None):
         # Default size as fallback
         width, height = 200, 200
     
-    # Create a new image with space for text
-    new_img = Image.new('RGB', (width, height + 60), color='white')
+    # Create a new image with space for text. Labels are black on white, so an
+    # 8-bit greyscale canvas keeps antialiased text at a third of RGB's size
+    new_img = Image.new('L', (width, height + 60), color='white')
     
     # Use a more reliable method to paste the image
     try:
@@ -1463,9 +1793,9 @@ def generate_qr_code(drive_info, label=None):
         print(f"Error during paste operation: {e}")
         # Alternative paste method
         try:
-            # Convert to RGB if needed
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+            # Convert to greyscale if needed
+            if img.mode != 'L':
+                img = img.convert('L')
             region = img.crop((0, 0, width, height))
             new_img.paste(region, (0, 0, width, height))
         except Exception as e2:
@@ -1475,10 +1805,7 @@ def generate_qr_code(drive_info, label=None):
     
     # Add text
     draw = ImageDraw.Draw(new_img)
-    try:
-        font = ImageFont.truetype("Arial", 24)
-    except IOError:
-        font = ImageFont.load_default()
+    font = get_default_font(24)
     
     # If using a very old version of PIL, anchor may not be supported
     try:
@@ -1495,37 +1822,85 @@ def generate_qr_code(drive_info, label=None):
         position = ((width - text_size[0]) // 2, height + 30 - text_size[1] // 2)
         draw.text(position, label_text, fill='black', font=font)
     
+    return new_img
+
+def generate_qr_code(drive_info, label=None, conn=None):
+    """Generate a QR code with drive information for printing"""
+    qr_data = {
+        "drive_id": drive_info["id"],
+        "volume_name": drive_info["volume_name"],
+        "size_gb": round(drive_info["size_bytes"] / (1024**3), 2),
+        "date_cataloged": drive_info["date_cataloged"]
+    }
+    
+    if label:
+        qr_data["label"] = label
+        drive_info["label"] = label
+    
+    # QR code with the label text below it
+    label_text = label or drive_info["volume_name"]
+    new_img = render_label_image(json.dumps(qr_data, separators=(",", ":")), label_text)
+    
     # Save image
     os.makedirs(os.path.expanduser("~/media-asset-tracker/qr-codes"), exist_ok=True)
     qr_path = os.path.expanduser(f"~/media-asset-tracker/qr-codes/{label_text}.png")
-    new_img.save(qr_path)
+    # Fast zlib level: bilevel label art compresses nearly as well at 1 as at the default 6
+    new_img.save(qr_path, "PNG", compress_level=1)
     
-    # Update drive record with QR code path
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
+    # Update drive record with QR code path (batch callers pass the
+    # connection and commit once themselves)
+    commit = conn is None
+    if conn is None:
+        conn = get_db_connection()
+    conn.execute(
         "UPDATE drives SET qr_code_path = ?, label = ? WHERE id = ?",
         (qr_path, label_text, drive_info["id"])
     )
-    conn.commit()
-    conn.close()
+    if commit:
+        conn.commit()
     
     print(f"QR code generated successfully: {qr_path}")
     return qr_path
 
+def generate_qr_codes(drive_infos, label=None):
+    """
+    Generate QR codes for several drives in one pass
+    
+    Args:
+        drive_infos: List of drive info dicts, as passed to generate_qr_code
+        label: Optional custom label (only meaningful for a single drive)
+        
+    Returns:
+        List of generated QR code paths
+    """
+    # One commit for the whole batch instead of one per label
+    conn = get_db_connection()
+    qr_paths = [generate_qr_code(drive_info, label, conn=conn) for drive_info in drive_infos]
+    conn.commit()
+    
+    return qr_paths
+
 def search_files(query, search_type="filename"):
     """Search for files in the database based on query and search type"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Return results as dictionaries
-    cursor = conn.cursor()
+    cursor = get_db_connection().cursor()
+    cursor.row_factory = sqlite3.Row  # Return results as dictionaries
+    
+    # Substring patterns on the filename and path are index lookups when the
+    # trigram index exists
+    if has_files_fts(cursor):
+        filename_match = "f.rowid IN (SELECT rowid FROM files_fts WHERE filename LIKE ?)"
+        path_match = "f.rowid IN (SELECT rowid FROM files_fts WHERE path LIKE ?)"
+    else:
+        filename_match = "f.filename LIKE ?"
+        path_match = "f.path LIKE ?"
     
     # Build query based on search type
     if search_type == "filename":
-        sql = """
+        sql = f"""
         SELECT f.*, d.label, d.volume_name 
         FROM files f
         JOIN drives d ON f.drive_id = d.id
-        WHERE f.filename LIKE ?
+        WHERE {filename_match}
         ORDER BY f.date_modified DESC
         LIMIT 100
         """
@@ -1569,32 +1944,31 @@ def search_files(query, search_type="filename"):
         cursor.execute(sql, (f"%{query}%",))
     
     else:  # General search
-        sql = """
+        sql = f"""
         SELECT f.*, d.label, d.volume_name 
         FROM files f
         JOIN drives d ON f.drive_id = d.id
         WHERE 
-            f.filename LIKE ? OR
-            f.path LIKE ? OR
+            {path_match} OR
             d.label LIKE ? OR
             d.volume_name LIKE ? OR
             (f.transcription_status = 'completed' AND f.transcription LIKE ?)
         ORDER BY f.date_modified DESC
         LIMIT 100
         """
+        # The filename is the last component of the path, so matching the
+        # path covers both
         search_pattern = f"%{query}%"
-        cursor.execute(sql, (search_pattern, search_pattern, search_pattern, search_pattern, search_pattern))
+        cursor.execute(sql, (search_pattern, search_pattern, search_pattern, search_pattern))
     
     results = cursor.fetchall()
-    conn.close()
     
     return [dict(row) for row in results]
 
 def list_drives():
     """List all cataloged drives in the system"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    cursor = get_db_connection().cursor()
+    cursor.row_factory = sqlite3.Row
     
     cursor.execute("""
     SELECT id, label, volume_name, size_bytes, free_bytes, format, mount_point, 
@@ -1604,13 +1978,12 @@ def list_drives():
     """)
     
     drives = cursor.fetchall()
-    conn.close()
     
     return [dict(drive) for drive in drives]
 
 def create_project(name, client=None, notes=None):
     """Create a new project entry"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_db_connection()
     cursor = conn.cursor()
     
     project_id = str(uuid.uuid4())
@@ -1620,69 +1993,58 @@ def create_project(name, client=None, notes=None):
     """, (project_id, name, client, datetime.datetime.now().isoformat(), notes))
     
     conn.commit()
-    conn.close()
     
     return project_id
 
 def add_files_to_project(project_id, file_paths=None, search_pattern=None):
     """Add files to a project by paths or search pattern"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_db_connection()
     cursor = conn.cursor()
     
     # Verify project exists
     cursor.execute("SELECT id FROM projects WHERE id = ?", (project_id,))
     if not cursor.fetchone():
         print(f"Error: Project with ID {project_id} not found")
-        conn.close()
         return 0
     
-    files_added = 0
+    # Collect the matching file IDs first (a set, so files matched by more
+    # than one path or the pattern are only inserted once)
+    file_ids = set()
+    if has_files_fts(cursor):
+        path_match = "rowid IN (SELECT rowid FROM files_fts WHERE path LIKE ?)"
+    else:
+        path_match = "path LIKE ?"
     
     if file_paths:
         for path in file_paths:
             # Find file in database
             cursor.execute(
-                "SELECT id FROM files WHERE path LIKE ? OR filename = ?", 
+                f"""
+                SELECT id FROM files WHERE {path_match}
+                UNION
+                SELECT id FROM files WHERE filename = ?
+                """,
                 (f"%{path}%", os.path.basename(path))
             )
-            file_rows = cursor.fetchall()
-            
-            for file_row in file_rows:
-                # Add file to project
-                try:
-                    cursor.execute(
-                        "INSERT OR IGNORE INTO project_files (project_id, file_id) VALUES (?, ?)",
-                        (project_id, file_row[0])
-                    )
-                    files_added += 1
-                except sqlite3.IntegrityError:
-                    # File already in project
-                    pass
+            file_ids.update(row[0] for row in cursor.fetchall())
     
     if search_pattern:
         # Find files by pattern
         cursor.execute(
-            """
-            SELECT id FROM files 
-            WHERE filename LIKE ? OR path LIKE ?
-            """, 
-            (f"%{search_pattern}%", f"%{search_pattern}%")
+            f"SELECT id FROM files WHERE {path_match}",
+            (f"%{search_pattern}%",)
         )
-        file_rows = cursor.fetchall()
-        
-        for file_row in file_rows:
-            try:
-                cursor.execute(
-                    "INSERT OR IGNORE INTO project_files (project_id, file_id) VALUES (?, ?)",
-                    (project_id, file_row[0])
-                )
-                files_added += 1
-            except sqlite3.IntegrityError:
-                # File already in project
-                pass
+        file_ids.update(row[0] for row in cursor.fetchall())
+    
+    # Files already in the project are ignored and not counted
+    cursor.executemany(
+        "INSERT OR IGNORE INTO project_files (project_id, file_id) VALUES (?, ?)",
+        [(project_id, file_id) for file_id in file_ids]
+    )
+    # rowcount leaves out the rows written by the project_files triggers
+    files_added = cursor.rowcount
     
     conn.commit()
-    conn.close()
     
     return files_added
 
@@ -2130,10 +2492,11 @@ def main():
     )
     
     # Generate QR code
-    qr_parser = subparsers.add_parser("qr", help="Generate QR code for a drive")
+    qr_parser = subparsers.add_parser("qr", help="Generate QR codes for one or more drives")
     qr_parser.add_argument(
         "drive_id", 
-        help="ID of the drive to generate QR code for"
+        nargs="+",
+        help="ID(s) of the drive(s) to generate QR codes for"
     )
     qr_parser.add_argument(
         "-l", "--label", 
@@ -2290,25 +2653,32 @@ def main():
         )
         
     elif args.command == "qr":
+        if args.label and len(args.drive_id) > 1:
+            print("Error: --label can only be used with a single drive")
+            return
+        
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
+        placeholders = ','.join(['?'] * len(args.drive_id))
         cursor.execute(
-            "SELECT * FROM drives WHERE id = ?", 
-            (args.drive_id,)
+            f"SELECT * FROM drives WHERE id IN ({placeholders})", 
+            args.drive_id
         )
-        drive_row = cursor.fetchone()
-        
-        if drive_row:
-            column_names = [description[0] for description in cursor.description]
+        column_names = [description[0] for description in cursor.description]
+        drives = {}
+        for drive_row in cursor.fetchall():
             drive_info = {column_names[i]: drive_row[i] for i in range(len(column_names))}
-            
-            qr_path = generate_qr_code(drive_info, args.label)
-            print(f"QR code generated: {qr_path}")
-        else:
-            print(f"Error: Drive with ID {args.drive_id} not found")
-        
+            drives[drive_info["id"]] = drive_info
         conn.close()
         
+        for drive_id in args.drive_id:
+            if drive_id not in drives:
+                print(f"Error: Drive with ID {drive_id} not found")
+        
+        found = [drives[drive_id] for drive_id in args.drive_id if drive_id in drives]
+        for qr_path in generate_qr_codes(found, args.label):
+            print(f"QR code generated: {qr_path}")
+        
     elif args.command == "search":
         results = search_files(args.query, args.type)
         print(f"Found {len(results)} results for '{args.query}':")
@@ -10,8 +10,17 @@ import sys
 import sqlite3
 import json
 import datetime
+import queue
+import time
 from pathlib import Path
+from functools import lru_cache
 from flask import Flask, render_template, request, redirect, url_for, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Ensure media-asset-tracker directory exists
 os.makedirs(os.path.expanduser("~/media-asset-tracker"), exist_ok=True)
@@ -23,50 +32,156 @@ os.makedirs(QR_CODE_DIR, exist_ok=True)
 
 app = Flask(__name__)
 
-def dict_factory(cursor, row):
-    """Convert database row objects to dictionaries"""
-    return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
+class OrjsonProvider(DefaultJSONProvider):
+    """Encode jsonify responses with orjson; decoding stays with the stdlib"""
+    def dumps(self, obj, **kwargs):
+        option = 0
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Whether the database has the asset tracker's trigram files_fts index; set at startup
+HAS_FILES_FTS = False
+# Whether projects carry the trigger-maintained file_count column; set at startup
+HAS_PROJECT_FILE_COUNT = False
+
+# Idle connections kept open between requests. The dev server runs each
+# request on a new thread, so connections are pooled rather than thread-local.
+DB_POOL_SIZE = 4
+_db_pool = queue.LifoQueue()
 
 def get_db_connection():
-    """Get a database connection"""
+    """Get a database connection from the pool (hand it back with release_db_connection)"""
+    try:
+        return _db_pool.get_nowait()
+    except queue.Empty:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        # Rows support row['name'], and templates can use row.name
+        conn.row_factory = sqlite3.Row
+        # Applied once per pooled connection: readers don't block on the
+        # catalog writer under WAL, and pages come from mmap and a larger cache
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-65536')  # 64 MiB page cache
+        conn.execute('PRAGMA mmap_size=268435456')  # 256 MiB
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+
+def release_db_connection(conn):
+    """Return a connection to the pool, closing it if the pool is already full"""
+    if conn.in_transaction:
+        conn.rollback()
+    if _db_pool.qsize() < DB_POOL_SIZE:
+        _db_pool.put(conn)
+    else:
+        conn.close()
+
+def create_indexes():
+    """
+    Create the indexes the web pages' queries rely on, if they are missing
+    
+    Filename glob searches range-scan the filename index. The drive page
+    filters files by drive and sorts by modification date, and aggregates
+    sizes and extensions per drive; the file page looks up the projects a
+    file belongs to. Without these those are full scans of files and
+    project_files.
+    """
     conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = dict_factory
-    return conn
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_files_filename ON files (filename)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_files_drive_modified ON files (drive_id, date_modified)')
+    # Covers the per-drive stats and top-extensions queries without row lookups
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_files_drive_extension ON files (drive_id, extension, size_bytes)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_project_files_file ON project_files (file_id)')
+    conn.commit()
+    conn.close()
+
+def has_files_fts():
+    """Check for the files_fts index, which the asset tracker creates and keeps in sync"""
+    conn = sqlite3.connect(DB_PATH)
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'files_fts'").fetchone()
+    conn.close()
+    return row is not None
+
+def has_project_file_count():
+    """Check for the projects.file_count column, which the asset tracker adds and keeps in sync"""
+    conn = sqlite3.connect(DB_PATH)
+    columns = [column[1] for column in conn.execute("PRAGMA table_info(projects)")]
+    conn.close()
+    return 'file_count' in columns
+
+# Short-lived results for the home page stats and the project list, which
+# change far less often than they are requested. Maps keys to (expiry, value).
+_query_cache = {}
+
+def cached(key, ttl, load):
+    """Return the cached value for key, calling load() if it is missing or older than ttl seconds"""
+    entry = _query_cache.get(key)
+    now = time.monotonic()
+    if entry and entry[0] > now:
+        return entry[1]
+    value = load()
+    _query_cache[key] = (now + ttl, value)
+    return value
+
+def invalidate_cache(*keys):
+    """Drop cached values after a write that changes them"""
+    for key in keys:
+        _query_cache.pop(key, None)
+
+FILESIZE_UNITS = ((1, 'B'), (1024, 'KB'), (1024**2, 'MB'), (1024**3, 'GB'))
 
 def format_filesize(size_bytes):
     """Format file size in bytes to human-readable format"""
-    if size_bytes < 1024:
+    # Every 10 bits is one 1024x unit step. Sizes summed by SQLite can come
+    # back as REAL, so the bit length is taken of the whole bytes
+    unit = min(max((int(size_bytes).bit_length() - 1) // 10, 0), 3)
+    if not unit:
         return f"{size_bytes} B"
-    elif size_bytes < 1024**2:
-        return f"{size_bytes/1024:.2f} KB"
-    elif size_bytes < 1024**3:
-        return f"{size_bytes/(1024**2):.2f} MB"
-    else:
-        return f"{size_bytes/(1024**3):.2f} GB"
+    divisor, suffix = FILESIZE_UNITS[unit]
+    return f"{size_bytes/divisor:.2f} {suffix}"
 
 @app.template_filter('filesize')
 def filesize_filter(size_bytes):
     """Template filter for formatting file sizes"""
     return format_filesize(size_bytes)
 
-@app.route('/')
-def index():
-    """Home page with search and stats"""
+# Plain string builders for the detail pages linked from result loops;
+# url_for walks the URL map on every call
+@app.template_global()
+def drive_url(drive_id):
+    return f"/drive/{drive_id}"
+
+@app.template_global()
+def project_url(project_id):
+    return f"/project/{project_id}"
+
+@app.template_global()
+def file_url(file_id):
+    return f"/file/{file_id}"
+
+def load_home_stats():
+    """Query the stats and recent items shown on the home page"""
     conn = get_db_connection()
     
-    # Get basic stats
+    # Get basic stats in one round trip
     cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) as drive_count FROM drives")
-    drive_count = cursor.fetchone()['drive_count']
-    
-    cursor.execute("SELECT COUNT(*) as file_count FROM files")
-    file_count = cursor.fetchone()['file_count']
-    
-    cursor.execute("SELECT COUNT(*) as project_count FROM projects")
-    project_count = cursor.fetchone()['project_count']
-    
-    cursor.execute("SELECT SUM(size_bytes) as total_size FROM drives")
-    total_size = cursor.fetchone()['total_size'] or 0
+    cursor.execute("""
+    SELECT
+        (SELECT COUNT(*) FROM drives) as drive_count,
+        (SELECT COUNT(*) FROM files) as file_count,
+        (SELECT COUNT(*) FROM projects) as project_count,
+        (SELECT SUM(size_bytes) FROM drives) as total_size
+    """)
+    stats = cursor.fetchone()
+    drive_count = stats['drive_count']
+    file_count = stats['file_count']
+    project_count = stats['project_count']
+    total_size = stats['total_size'] or 0
     
     # Get recent drives
     cursor.execute("""
@@ -86,10 +201,9 @@ def index():
     """)
     recent_projects = cursor.fetchall()
     
-    conn.close()
+    release_db_connection(conn)
     
-    return render_template(
-        'index.html', 
+    return dict(
         drive_count=drive_count,
         file_count=file_count,
         project_count=project_count,
@@ -98,6 +212,11 @@ def index():
         recent_projects=recent_projects
     )
 
+@app.route('/')
+def index():
+    """Home page with search and stats"""
+    return render_template('index.html', **cached('home', 30, load_home_stats))
+
 @app.route('/search', methods=['GET', 'POST'])
 def search():
     """Search page"""
@@ -110,35 +229,107 @@ def search():
         cursor = conn.cursor()
         
         # Build query based on search type
-        if search_type == "filename":
+        # Only the columns the results table shows, so media_info and
+        # transcription text aren't read for every hit
+        # Wildcard patterns ("IMG_*") are matched with GLOB, which is case
+        # sensitive and can range-scan the filename index on a literal prefix.
+        # Brackets are searched for as text, since names like "clip[1].mov"
+        # are far more common than character classes, and a pattern that
+        # matches nothing falls back to the substring search below
+        if search_type == "filename" and any(char in query for char in "*?") and "[" not in query:
             sql = """
-            SELECT f.*, d.label, d.volume_name 
+            SELECT f.id, f.drive_id, f.path, f.filename, f.size_bytes, f.date_modified, d.label, d.volume_name
             FROM files f
             JOIN drives d ON f.drive_id = d.id
-            WHERE f.filename LIKE ?
+            WHERE f.filename GLOB ?
             ORDER BY f.date_modified DESC
             LIMIT 100
             """
-            cursor.execute(sql, (f"%{query}%", f"%{query}%"))
+            cursor.execute(sql, (query,))
+            results = cursor.fetchall()
         
-        else:  # General search
-            sql = """
-            SELECT f.*, d.label, d.volume_name 
-            FROM files f
-            JOIN drives d ON f.drive_id = d.id
-            WHERE 
-                f.filename LIKE ? OR
-                f.path LIKE ? OR
-                d.label LIKE ? OR
-                d.volume_name LIKE ?
-            ORDER BY f.date_modified DESC
-            LIMIT 100
-            """
-            search_pattern = f"%{query}%"
-            cursor.execute(sql, (search_pattern, search_pattern, search_pattern, search_pattern))
+        if not results:
+            if search_type == "filename" and HAS_FILES_FTS:
+                # Substring LIKE patterns on the trigram index are index lookups
+                sql = """
+                SELECT f.id, f.drive_id, f.path, f.filename, f.size_bytes, f.date_modified, d.label, d.volume_name
+                FROM files_fts
+                JOIN files f ON f.rowid = files_fts.rowid
+                JOIN drives d ON f.drive_id = d.id
+                WHERE files_fts.filename LIKE ?
+                ORDER BY f.date_modified DESC
+                LIMIT 100
+                """
+                cursor.execute(sql, (f"%{query}%",))
+            
+            elif search_type == "filename":
+                sql = """
+                SELECT f.id, f.drive_id, f.path, f.filename, f.size_bytes, f.date_modified, d.label, d.volume_name
+                FROM files f
+                JOIN drives d ON f.drive_id = d.id
+                WHERE f.filename LIKE ?
+                ORDER BY f.date_modified DESC
+                LIMIT 100
+                """
+                cursor.execute(sql, (f"%{query}%",))
+            
+            elif search_type == "extension":
+                sql = """
+                SELECT f.id, f.drive_id, f.path, f.filename, f.size_bytes, f.date_modified, d.label, d.volume_name
+                FROM files f
+                JOIN drives d ON f.drive_id = d.id
+                WHERE f.extension = ?
+                ORDER BY f.date_modified DESC
+                LIMIT 100
+                """
+                cursor.execute(sql, (query.lstrip('.').lower(),))
+            
+            elif search_type == "project":
+                sql = """
+                SELECT f.id, f.drive_id, f.path, f.filename, f.size_bytes, f.date_modified, d.label, d.volume_name, p.name as project_name, p.id as project_id
+                FROM files f
+                JOIN drives d ON f.drive_id = d.id
+                JOIN project_files pf ON f.id = pf.file_id
+                JOIN projects p ON pf.project_id = p.id
+                WHERE p.name LIKE :pattern OR p.client LIKE :pattern
+                ORDER BY f.date_modified DESC
+                LIMIT 100
+                """
+                cursor.execute(sql, {'pattern': f"%{query}%"})
+            
+            elif HAS_FILES_FTS:  # General search
+                # The filename is the last component of the path, so matching the
+                # path covers both. A named parameter is bound once for all terms
+                sql = """
+                SELECT f.id, f.drive_id, f.path, f.filename, f.size_bytes, f.date_modified, d.label, d.volume_name
+                FROM files f
+                JOIN drives d ON f.drive_id = d.id
+                WHERE 
+                    f.rowid IN (SELECT rowid FROM files_fts WHERE path LIKE :pattern) OR
+                    d.label LIKE :pattern OR
+                    d.volume_name LIKE :pattern
+                ORDER BY f.date_modified DESC
+                LIMIT 100
+                """
+                cursor.execute(sql, {'pattern': f"%{query}%"})
+            
+            else:  # General search
+                sql = """
+                SELECT f.id, f.drive_id, f.path, f.filename, f.size_bytes, f.date_modified, d.label, d.volume_name
+                FROM files f
+                JOIN drives d ON f.drive_id = d.id
+                WHERE 
+                    f.path LIKE :pattern OR
+                    d.label LIKE :pattern OR
+                    d.volume_name LIKE :pattern
+                ORDER BY f.date_modified DESC
+                LIMIT 100
+                """
+                cursor.execute(sql, {'pattern': f"%{query}%"})
+            
+            results = cursor.fetchall()
         
-        results = cursor.fetchall()
-        conn.close()
+        release_db_connection(conn)
     
     return render_template('search.html', query=query, type=search_type, results=results)
 
@@ -156,7 +347,7 @@ def drives():
     """)
     
     drives = cursor.fetchall()
-    conn.close()
+    release_db_connection(conn)
     
     return render_template('drives.html', drives=drives)
 
@@ -177,7 +368,7 @@ def drive_detail(drive_id):
     drive = cursor.fetchone()
     
     if not drive:
-        conn.close()
+        release_db_connection(conn)
         return "Drive not found", 404
     
     # Get file stats
@@ -215,7 +406,7 @@ def drive_detail(drive_id):
     
     files = cursor.fetchall()
     
-    conn.close()
+    release_db_connection(conn)
     
     return render_template(
         'drive_detail.html', 
@@ -231,20 +422,30 @@ def projects():
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("""
-    SELECT p.id, p.name, p.client, p.date_created, p.notes,
-           COUNT(pf.file_id) as file_count
-    FROM projects p
-    LEFT JOIN project_files pf ON p.id = pf.project_id
-    GROUP BY p.id
-    ORDER BY p.date_created DESC
-    """)
+    if HAS_PROJECT_FILE_COUNT:
+        cursor.execute("""
+        SELECT id, name, client, date_created, notes, file_count
+        FROM projects
+        ORDER BY date_created DESC
+        """)
+    else:
+        cursor.execute("""
+        SELECT p.id, p.name, p.client, p.date_created, p.notes,
+               COUNT(pf.file_id) as file_count
+        FROM projects p
+        LEFT JOIN project_files pf ON p.id = pf.project_id
+        GROUP BY p.id
+        ORDER BY p.date_created DESC
+        """)
     
     projects = cursor.fetchall()
-    conn.close()
+    release_db_connection(conn)
     
     return render_template('projects.html', projects=projects)
 
+# Files listed per page of the project detail page
+PROJECT_PAGE_SIZE = 100
+
 @app.route('/project/<project_id>')
 def project_detail(project_id):
     """Project detail page"""
@@ -261,30 +462,66 @@ def project_detail(project_id):
     project = cursor.fetchone()
     
     if not project:
-        conn.close()
+        release_db_connection(conn)
         return "Project not found", 404
     
-    # Get project files
-    cursor.execute("""
-    SELECT f.id, f.filename, f.path, f.size_bytes, f.date_modified,
-           d.label, d.volume_name, d.id as drive_id
-    FROM files f
-    JOIN drives d ON f.drive_id = d.id
-    JOIN project_files pf ON f.id = pf.file_id
-    WHERE pf.project_id = ?
-    ORDER BY f.date_modified DESC
-    """, (project_id,))
+    # Get one page of project files, newest first. The page position is the
+    # (date_modified, id) of the last file shown, passed back as ?cursor=.
+    # Files with no date_modified sort as '' so they come last, after every
+    # dated file, instead of dropping out of the comparison as NULLs.
+    after = request.args.get('cursor')
+    if after:
+        after_date, _, after_id = after.rpartition('_')
+        cursor.execute("""
+        SELECT f.id, f.filename, f.path, f.size_bytes, f.date_modified,
+               d.label, d.volume_name, d.id as drive_id
+        FROM files f
+        JOIN drives d ON f.drive_id = d.id
+        JOIN project_files pf ON f.id = pf.file_id
+        WHERE pf.project_id = ? AND (COALESCE(f.date_modified, ''), f.id) < (?, ?)
+        ORDER BY COALESCE(f.date_modified, '') DESC, f.id DESC
+        LIMIT ?
+        """, (project_id, after_date, after_id, PROJECT_PAGE_SIZE))
+    else:
+        cursor.execute("""
+        SELECT f.id, f.filename, f.path, f.size_bytes, f.date_modified,
+               d.label, d.volume_name, d.id as drive_id
+        FROM files f
+        JOIN drives d ON f.drive_id = d.id
+        JOIN project_files pf ON f.id = pf.file_id
+        WHERE pf.project_id = ?
+        ORDER BY COALESCE(f.date_modified, '') DESC, f.id DESC
+        LIMIT ?
+        """, (project_id, PROJECT_PAGE_SIZE))
     
     files = cursor.fetchall()
     
-    conn.close()
+    release_db_connection(conn)
+    
+    next_cursor = None
+    if len(files) == PROJECT_PAGE_SIZE:
+        next_cursor = f"{files[-1]['date_modified'] or ''}_{files[-1]['id']}"
     
     return render_template(
         'project_detail.html', 
         project=project, 
-        files=files
+        files=files,
+        next_cursor=next_cursor
     )
 
+@lru_cache(maxsize=1024)
+def parse_media_info(raw):
+    """
+    Parse a stored ffprobe JSON blob, or return None if it is malformed
+    
+    Results are cached by the raw text, which only changes when a file is
+    re-probed. The returned dict is shared between requests; don't modify it.
+    """
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
 @app.route('/file/<file_id>')
 def file_detail(file_id):
     """File detail page"""
@@ -302,7 +539,7 @@ def file_detail(file_id):
     file = cursor.fetchone()
     
     if not file:
-        conn.close()
+        release_db_connection(conn)
         return "File not found", 404
     
     # Get projects this file belongs to
@@ -318,12 +555,9 @@ def file_detail(file_id):
     # Parse media info if available
     media_info = None
     if file['media_info']:
-        try:
-            media_info = json.loads(file['media_info'])
-        except:
-            pass
+        media_info = parse_media_info(file['media_info'])
     
-    conn.close()
+    release_db_connection(conn)
     
     return render_template(
         'file_detail.html', 
@@ -344,7 +578,7 @@ def get_qr_code(drive_id):
     )
     
     drive = cursor.fetchone()
-    conn.close()
+    release_db_connection(conn)
     
     if not drive or not drive['qr_code_path'] or not os.path.exists(drive['qr_code_path']):
         return "QR code not found", 404
@@ -389,7 +623,8 @@ def add_project():
             message = "Project created successfully"
         
         conn.commit()
-        conn.close()
+        release_db_connection(conn)
+        invalidate_cache('home', 'projects')
         
         return redirect(url_for('project_detail', project_id=project_id))
     
@@ -402,7 +637,7 @@ def add_project():
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
         project = cursor.fetchone()
-        conn.close()
+        release_db_connection(conn)
     
     return render_template('add_project.html', project=project)
 
@@ -423,23 +658,19 @@ def api_add_to_project():
     # Verify project exists
     cursor.execute("SELECT id FROM projects WHERE id = ?", (project_id,))
     if not cursor.fetchone():
-        conn.close()
+        release_db_connection(conn)
         return jsonify({'success': False, 'error': 'Project not found'}), 404
     
-    added = 0
-    for file_id in file_ids:
-        try:
-            cursor.execute(
-                "INSERT OR IGNORE INTO project_files (project_id, file_id) VALUES (?, ?)",
-                (project_id, file_id)
-            )
-            if cursor.rowcount > 0:
-                added += 1
-        except:
-            pass
+    # Files already in the project are ignored and not counted
+    cursor.executemany(
+        "INSERT OR IGNORE INTO project_files (project_id, file_id) VALUES (?, ?)",
+        [(project_id, file_id) for file_id in set(file_ids)]
+    )
+    # rowcount leaves out the rows written by the project_files triggers
+    added = cursor.rowcount
     
     conn.commit()
-    conn.close()
+    release_db_connection(conn)
     
     return jsonify({
         'success': True, 
@@ -447,357 +678,22 @@ def api_add_to_project():
         'message': f"Added {added} files to project"
     })
 
-# Templates directory
-@app.route('/templates/<path:path>')
-def serve_template(path):
-    """Serve basic HTML templates for the pages"""
-    templates = {
-        'index.html': """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Media Asset Tracker</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css">
-</head>
-<body>
-    <nav class="navbar navbar-expand-lg navbar-dark bg-dark">
-        <div class="container">
-            <a class="navbar-brand" href="/">Media Asset Tracker</a>
-            <button class="navbar-toggler" type="button" data-bs-toggle="collapse" data-bs-target="#navbarNav">
-                <span class="navbar-toggler-icon"></span>
-            </button>
-            <div class="collapse navbar-collapse" id="navbarNav">
-                <ul class="navbar-nav">
-                    <li class="nav-item">
-                        <a class="nav-link" href="/drives">Drives</a>
-                    </li>
-                    <li class="nav-item">
-                        <a class="nav-link" href="/projects">Projects</a>
-                    </li>
-                    <li class="nav-item">
-                        <a class="nav-link" href="/search">Search</a>
-                    </li>
-                </ul>
-            </div>
-        </div>
-    </nav>
-    
-    <div class="container mt-4">
-        <h1>Media Asset Tracker</h1>
-        
-        <div class="row">
-            <div class="col-md-6">
-                <div class="card mb-4">
-                    <div class="card-header">
-                        <h5 class="card-title">Quick Search</h5>
-                    </div>
-                    <div class="card-body">
-                        <form action="/search" method="get">
-                            <div class="input-group mb-3">
-                                <input type="text" class="form-control" name="query" placeholder="Search files...">
-                                <button class="btn btn-primary" type="submit">Search</button>
-                            </div>
-                        </form>
-                    </div>
-                </div>
-                
-                <div class="card">
-                    <div class="card-header">
-                        <h5 class="card-title">System Stats</h5>
-                    </div>
-                    <div class="card-body">
-                        <p><strong>Total Drives:</strong> {{ drive_count }}</p>
-                        <p><strong>Total Files:</strong> {{ file_count }}</p>
-                        <p><strong>Total Projects:</strong> {{ project_count }}</p>
-                        <p><strong>Total Storage:</strong> {{ total_size }}</p>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="col-md-6">
-                <div class="card mb-4">
-                    <div class="card-header d-flex justify-content-between align-items-center">
-                        <h5 class="card-title mb-0">Recent Drives</h5>
-                        <a href="/drives" class="btn btn-sm btn-outline-primary">View All</a>
-                    </div>
-                    <div class="card-body">
-                        {% if recent_drives %}
-                            <ul class="list-group list-group-flush">
-                                {% for drive in recent_drives %}
-                                    <li class="list-group-item d-flex justify-content-between align-items-center">
-                                        <a href="/drive/{{ drive.id }}">
-                                            {{ drive.label or drive.volume_name }}
-                                        </a>
-                                        <span class="badge bg-secondary">{{ drive.size_bytes|filesize }}</span>
-                                    </li>
-                                {% endfor %}
-                            </ul>
-                        {% else %}
-                            <p class="text-muted">No drives cataloged yet</p>
-                        {% endif %}
-                    </div>
-                </div>
-                
-                <div class="card">
-                    <div class="card-header d-flex justify-content-between align-items-center">
-                        <h5 class="card-title mb-0">Recent Projects</h5>
-                        <a href="/projects" class="btn btn-sm btn-outline-primary">View All</a>
-                    </div>
-                    <div class="card-body">
-                        {% if recent_projects %}
-                            <ul class="list-group list-group-flush">
-                                {% for project in recent_projects %}
-                                    <li class="list-group-item">
-                                        <a href="/project/{{ project.id }}">
-                                            {{ project.name }}
-                                        </a>
-                                        {% if project.client %}
-                                            <span class="text-muted">- {{ project.client }}</span>
-                                        {% endif %}
-                                    </li>
-                                {% endfor %}
-                            </ul>
-                        {% else %}
-                            <p class="text-muted">No projects created yet</p>
-                        {% endif %}
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
-</body>
-</html>
-        """,
-        'search.html': """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Search - Media Asset Tracker</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css">
-</head>
-<body>
-    <nav class="navbar navbar-expand-lg navbar-dark bg-dark">
-        <div class="container">
-            <a class="navbar-brand" href="/">Media Asset Tracker</a>
-            <button class="navbar-toggler" type="button" data-bs-toggle="collapse" data-bs-target="#navbarNav">
-                <span class="navbar-toggler-icon"></span>
-            </button>
-            <div class="collapse navbar-collapse" id="navbarNav">
-                <ul class="navbar-nav">
-                    <li class="nav-item">
-                        <a class="nav-link" href="/drives">Drives</a>
-                    </li>
-                    <li class="nav-item">
-                        <a class="nav-link" href="/projects">Projects</a>
-                    </li>
-                    <li class="nav-item">
-                        <a class="nav-link active" href="/search">Search</a>
-                    </li>
-                </ul>
-            </div>
-        </div>
-    </nav>
-    
-    <div class="container mt-4">
-        <h1>Search Files</h1>
-        
-        <div class="card mb-4">
-            <div class="card-body">
-                <form action="/search" method="get">
-                    <div class="row">
-                        <div class="col-md-8">
-                            <input type="text" class="form-control" name="query" value="{{ query }}" placeholder="Search term...">
-                        </div>
-                        <div class="col-md-2">
-                            <select class="form-select" name="type">
-                                <option value="any" {% if type == 'any' %}selected{% endif %}>All</option>
-                                <option value="filename" {% if type == 'filename' %}selected{% endif %}>Filename</option>
-                                <option value="extension" {% if type == 'extension' %}selected{% endif %}>Extension</option>
-                                <option value="project" {% if type == 'project' %}selected{% endif %}>Project</option>
-                            </select>
-                        </div>
-                        <div class="col-md-2">
-                            <button class="btn btn-primary w-100" type="submit">Search</button>
-                        </div>
-                    </div>
-                </form>
-            </div>
-        </div>
-        
-        {% if query %}
-            <h2>Results for "{{ query }}"</h2>
-            
-            {% if results %}
-                <p>Found {{ results|length }} results</p>
-                
-                <div class="table-responsive">
-                    <table class="table table-striped table-hover">
-                        <thead>
-                            <tr>
-                                <th>Filename</th>
-                                <th>Path</th>
-                                <th>Size</th>
-                                <th>Drive</th>
-                                <th>Modified</th>
-                                <th>Actions</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {% for file in results %}
-                                <tr>
-                                    <td>
-                                        <a href="/file/{{ file.id }}">{{ file.filename }}</a>
-                                    </td>
-                                    <td>{{ file.path }}</td>
-                                    <td>{{ file.size_bytes|filesize }}</td>
-                                    <td>
-                                        <a href="/drive/{{ file.drive_id }}">
-                                            {{ file.label or file.volume_name }}
-                                        </a>
-                                    </td>
-                                    <td>{{ file.date_modified }}</td>
-                                    <td>
-                                        <button class="btn btn-sm btn-outline-primary add-to-project"
-                                                data-file-id="{{ file.id }}"
-                                                data-filename="{{ file.filename }}">
-                                            Add to Project
-                                        </button>
-                                    </td>
-                                </tr>
-                            {% endfor %}
-                        </tbody>
-                    </table>
-                </div>
-                
-                <!-- Add to Project Modal -->
-                <div class="modal fade" id="addToProjectModal" tabindex="-1">
-                    <div class="modal-dialog">
-                        <div class="modal-content">
-                            <div class="modal-header">
-                                <h5 class="modal-title">Add to Project</h5>
-                                <button type="button" class="btn-close" data-bs-dismiss="modal"></button>
-                            </div>
-                            <div class="modal-body">
-                                <p>Add <span id="selectedFileName"></span> to project:</p>
-                                <select class="form-select" id="projectSelect">
-                                    <option value="">Loading projects...</option>
-                                </select>
-                                <div class="mt-3">
-                                    <a href="/add-project" class="btn btn-sm btn-link">Create New Project</a>
-                                </div>
-                            </div>
-                            <div class="modal-footer">
-                                <button type="button" class="btn btn-secondary" data-bs-dismiss="modal">Cancel</button>
-                                <button type="button" class="btn btn-primary" id="confirmAddToProject">Add</button>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                
-                <script>
-                    // Load projects for the modal
-                    function loadProjects() {
-                        fetch('/api/projects')
-                            .then(response => response.json())
-                            .then(data => {
-                                const select = document.getElementById('projectSelect');
-                                select.innerHTML = '';
-                                
-                                if (data.length === 0) {
-                                    const option = document.createElement('option');
-                                    option.value = '';
-                                    option.textContent = 'No projects found';
-                                    select.appendChild(option);
-                                    return;
-                                }
-                                
-                                data.forEach(project => {
-                                    const option = document.createElement('option');
-                                    option.value = project.id;
-                                    option.textContent = project.name;
-                                    select.appendChild(option);
-                                });
-                            });
-                    }
-                    
-                    // Add to project buttons
-                    document.querySelectorAll('.add-to-project').forEach(button => {
-                        button.addEventListener('click', function() {
-                            const fileId = this.dataset.fileId;
-                            const filename = this.dataset.filename;
-                            
-                            document.getElementById('selectedFileName').textContent = filename;
-                            document.getElementById('confirmAddToProject').dataset.fileId = fileId;
-                            
-                            loadProjects();
-                            
-                            const modal = new bootstrap.Modal(document.getElementById('addToProjectModal'));
-                            modal.show();
-                        });
-                    });
-                    
-                    // Confirm add to project
-                    document.getElementById('confirmAddToProject').addEventListener('click', function() {
-                        const fileId = this.dataset.fileId;
-                        const projectId = document.getElementById('projectSelect').value;
-                        
-                        if (!projectId) return;
-                        
-                        fetch('/api/add-to-project', {
-                            method: 'POST',
-                            headers: {
-                                'Content-Type': 'application/json'
-                            },
-                            body: JSON.stringify({
-                                project_id: projectId,
-                                file_ids: [fileId]
-                            })
-                        })
-                        .then(response => response.json())
-                        .then(data => {
-                            if (data.success) {
-                                const modal = bootstrap.Modal.getInstance(document.getElementById('addToProjectModal'));
-                                modal.hide();
-                                alert('File added to project successfully');
-                            } else {
-                                alert('Error: ' + data.error);
-                            }
-                        });
-                    });
-                </script>
-            {% else %}
-                <div class="alert alert-info">
-                    No results found for "{{ query }}"
-                </div>
-            {% endif %}
-        {% endif %}
-    </div>
-    
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
-</body>
-</html>
-        """
-    }
-    
-    if path in templates:
-        return templates[path]
-    else:
-        return "Template not found", 404
-
 @app.route('/api/projects')
 def api_projects():
     """API to get projects list"""
+    return jsonify(cached('projects', 60, load_project_list))
+
+def load_project_list():
+    """Query the project names offered by the add-to-project dialog"""
     conn = get_db_connection()
     cursor = conn.cursor()
     
     cursor.execute("SELECT id, name FROM projects ORDER BY name")
-    projects = cursor.fetchall()
+    projects = [dict(row) for row in cursor.fetchall()]
     
-    conn.close()
+    release_db_connection(conn)
     
-    return jsonify(projects)
+    return projects
 
 if __name__ == '__main__':
     # Create database if it doesn't exist
@@ -805,29 +701,18 @@ if __name__ == '__main__':
         print("Database not found. Please run the 'media-asset-tracker init' command first.")
         sys.exit(1)
     
+    create_indexes()
+    HAS_FILES_FTS = has_files_fts()
+    if not HAS_FILES_FTS:
+        print("Search index not found; run 'media-asset-tracker init' to enable faster search.")
+    HAS_PROJECT_FILE_COUNT = has_project_file_count()
+    
     print(f"Starting web interface at http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)}%",))
-        
-        elif search_type == "extension":
-            sql = """
-            SELECT f.*, d.label, d.volume_name 
-            FROM files f
-            JOIN drives d ON f.drive_id = d.id
-            WHERE f.extension = ?
-            ORDER BY f.date_modified DESC
-            LIMIT 100
-            """
-            cursor.execute(sql, (query.lstrip('.').lower(),))
-        
-        elif search_type == "project":
-            sql = """
-            SELECT f.*, d.label, d.volume_name, p.name as project_name, p.id as project_id
-            FROM files f
-            JOIN drives d ON f.drive_id = d.id
-            JOIN project_files pf ON f.id = pf.file_id
-            JOIN projects p ON pf.project_id = p.id
-            WHERE p.name LIKE ? OR p.client LIKE ?
-            ORDER BY f.date_modified DESC
-            LIMIT 100
-            """
-            cursor.execute(sql, (f"%{query
\ No newline at end of file
+    # Serve with waitress when it is installed; Flask's server is meant for
+    # development and the debugger/reloader must not face the network
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host='0.0.0.0', port=5000, threaded=True)
+    else:
+        serve(app, host='0.0.0.0', port=5000, threads=DB_POOL_SIZE)
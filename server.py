@@ -1108,11 +1108,11 @@ def get_drive_qr_code(drive_id):
             box_size=10,
             border=4,
         )
-        qr.add_data(json.dumps(drive_info))
+        qr.add_data(json.dumps(drive_info, separators=(",", ":")))
         qr.make(fit=True)
         
         img = qr.make_image(fill_color="black", back_color="white")
-        img.save(qr_code_path)
+        img.save(qr_code_path, "PNG", compress_level=1)
         
         return send_from_directory(os.path.dirname(qr_code_path), os.path.basename(qr_code_path))
         
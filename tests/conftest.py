@@ -0,0 +1,112 @@
+"""
+Shared fixtures for the Python tools
+
+The asset tracker and web interface are scripts with hyphenated names, so
+they are loaded from their files. HOME points at a temporary directory so
+each test gets its own ~/media-asset-tracker database.
+"""
+
+import importlib.util
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The tables the web interface reads, as the asset tracker creates them,
+# with the project_files triggers that keep projects.file_count current
+CATALOG_SCHEMA = '''
+CREATE TABLE drives (
+    id TEXT PRIMARY KEY, label TEXT, volume_name TEXT, size_bytes INTEGER,
+    free_bytes INTEGER, format TEXT, mount_point TEXT, date_cataloged TEXT,
+    last_verified TEXT, notes TEXT, qr_code_path TEXT
+);
+CREATE TABLE files (
+    id TEXT PRIMARY KEY, drive_id TEXT, path TEXT, filename TEXT, extension TEXT,
+    size_bytes INTEGER, date_created TEXT, date_modified TEXT, checksum TEXT,
+    mime_type TEXT, media_info TEXT, thumbnail_path TEXT, transcription TEXT,
+    transcription_status TEXT, transcription_date TEXT
+);
+CREATE TABLE projects (
+    id TEXT PRIMARY KEY, name TEXT, client TEXT, date_created TEXT,
+    date_completed TEXT, notes TEXT, file_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE project_files (
+    project_id TEXT, file_id TEXT, PRIMARY KEY (project_id, file_id)
+);
+CREATE TRIGGER project_files_count_insert AFTER INSERT ON project_files BEGIN
+    UPDATE projects SET file_count = file_count + 1 WHERE id = new.project_id;
+END;
+CREATE TRIGGER project_files_count_delete AFTER DELETE ON project_files BEGIN
+    UPDATE projects SET file_count = file_count - 1 WHERE id = old.project_id;
+END;
+'''
+
+def load_script(name, relative_path):
+    """Import a script from the repository under the given module name"""
+    spec = importlib.util.spec_from_file_location(name, REPO_ROOT / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered before running it so Flask can find the module's templates
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+@pytest.fixture
+def asset_tracker(home):
+    """The asset tracker with a freshly initialized database"""
+    pytest.importorskip("whisper")
+    pytest.importorskip("qrcode")
+    module = load_script("asset_tracker", "scripts/utils/asset-tracker.py")
+    module.init_db()
+    yield module
+    conn = getattr(module._db_local, "conn", None)
+    if conn is not None:
+        conn.close()
+
+@pytest.fixture
+def web_interface(home):
+    """The web interface over an empty catalog database"""
+    pytest.importorskip("flask")
+    db_dir = home / "media-asset-tracker"
+    db_dir.mkdir()
+    conn = sqlite3.connect(db_dir / "asset-db.sqlite")
+    conn.executescript(CATALOG_SCHEMA)
+    conn.close()
+
+    module = load_script("web_interface", "scripts/utils/web-interface.py")
+    module.create_indexes()
+    module.HAS_FILES_FTS = module.has_files_fts()
+    module.HAS_PROJECT_FILE_COUNT = module.has_project_file_count()
+    module.app.config["TESTING"] = True
+    yield module
+    while not module._db_pool.empty():
+        module._db_pool.get_nowait().close()
+
+@pytest.fixture(params=["xlsxwriter", "openpyxl"])
+def csv_converter(request, monkeypatch):
+    """The pandas CSV converter, once with each XLSX writer it supports"""
+    pytest.importorskip("pandas")
+    openpyxl = pytest.importorskip("openpyxl")
+    module = load_script("convert_with_pandas", "tools/convert_with_pandas.py")
+    if request.param == "xlsxwriter":
+        if module.xlsxwriter is None:
+            pytest.skip("xlsxwriter is not installed")
+    else:
+        # The converter only falls back to openpyxl without xlsxwriter
+        monkeypatch.setattr(module, "xlsxwriter", None)
+        monkeypatch.setattr(module, "openpyxl", openpyxl, raising=False)
+    return module
+
+@pytest.fixture
+def catalog_db(home):
+    """Open a connection to the test catalog database"""
+    conn = sqlite3.connect(home / "media-asset-tracker" / "asset-db.sqlite")
+    yield conn
+    conn.close()
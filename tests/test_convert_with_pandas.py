@@ -0,0 +1,21 @@
+"""Round trips through tools/convert_with_pandas.py"""
+
+import io
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+def read_rows(xlsx_data):
+    """Return the cells of the first sheet, row by row"""
+    worksheet = openpyxl.load_workbook(io.BytesIO(xlsx_data)).active
+    return [list(row) for row in worksheet.iter_rows()]
+
+def test_url_like_strings_stay_plain_text(csv_converter):
+    long_url = "https://example.com/" + "a" * 2100
+    csv_data = f"link,mail,long\nhttp://example.com/clip.mov,mailto:a@b,{long_url}\n"
+
+    header, row = read_rows(csv_converter.convert_csv_to_xlsx(csv_data))
+
+    assert [cell.value for cell in row] == ["http://example.com/clip.mov", "mailto:a@b", long_url]
+    assert all(cell.hyperlink is None for cell in row)
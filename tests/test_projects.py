@@ -0,0 +1,67 @@
+"""Adding files to projects through the CLI and the web API, and listing them"""
+
+import html
+import re
+
+def add_files(conn, count, prefix="clip"):
+    """Catalog count files on one drive and return their IDs"""
+    file_ids = [f"{prefix}-{index}" for index in range(count)]
+    conn.executemany(
+        "INSERT INTO files (id, drive_id, path, filename, extension, size_bytes) VALUES (?, 'drive-1', ?, ?, 'mov', 1024)",
+        [(file_id, f"Shoot/{file_id}.mov", f"{file_id}.mov") for file_id in file_ids]
+    )
+    conn.commit()
+    return file_ids
+
+def test_add_files_to_project_counts_each_file_once(asset_tracker):
+    conn = asset_tracker.get_db_connection()
+    add_files(conn, 3)
+    project_id = asset_tracker.create_project("Doc", client="ACME")
+
+    assert asset_tracker.add_files_to_project(project_id, search_pattern="Shoot/clip-") == 3
+    # Files already in the project are not counted again
+    assert asset_tracker.add_files_to_project(project_id, search_pattern="Shoot/clip-") == 0
+    assert conn.execute("SELECT file_count FROM projects WHERE id = ?", (project_id,)).fetchone()[0] == 3
+
+def test_api_add_to_project_counts_each_file_once(web_interface, catalog_db):
+    file_ids = add_files(catalog_db, 3)
+    catalog_db.execute("INSERT INTO projects (id, name) VALUES ('project-1', 'Doc')")
+    catalog_db.commit()
+    client = web_interface.app.test_client()
+
+    response = client.post("/api/add-to-project", json={"project_id": "project-1", "file_ids": file_ids})
+    assert response.get_json()["added"] == 3
+
+    response = client.post("/api/add-to-project", json={"project_id": "project-1", "file_ids": file_ids})
+    assert response.get_json()["added"] == 0
+    assert catalog_db.execute("SELECT file_count FROM projects WHERE id = 'project-1'").fetchone()[0] == 3
+
+def test_project_detail_pages_through_every_file(web_interface, catalog_db):
+    file_ids = add_files(catalog_db, 250)
+    # Shared dates and missing ones, which have to be placed by file ID
+    catalog_db.executemany(
+        "UPDATE files SET date_modified = ? WHERE id = ?",
+        [(f"2024-01-{index % 7 + 1:02d}" if index % 5 else None, file_id)
+         for index, file_id in enumerate(file_ids)]
+    )
+    catalog_db.execute("INSERT INTO drives (id, label) VALUES ('drive-1', 'Shelf A')")
+    catalog_db.execute("INSERT INTO projects (id, name) VALUES ('project-1', 'Doc')")
+    catalog_db.executemany(
+        "INSERT INTO project_files (project_id, file_id) VALUES ('project-1', ?)",
+        [(file_id,) for file_id in file_ids]
+    )
+    catalog_db.commit()
+    client = web_interface.app.test_client()
+
+    shown = []
+    url = "/project/project-1"
+    while url:
+        page = client.get(url).get_data(as_text=True)
+        page_ids = re.findall(r'href="/file/([^"]+)"', page)
+        assert len(page_ids) <= web_interface.PROJECT_PAGE_SIZE
+        shown += page_ids
+        next_link = re.search(r'href="(/project/project-1\?cursor=[^"]+)"', page)
+        url = html.unescape(next_link.group(1)) if next_link else None
+
+    assert len(shown) == len(set(shown)) == 250
+    assert set(shown) == set(file_ids)
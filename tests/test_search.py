@@ -0,0 +1,36 @@
+"""Filename searches on the web interface's search page"""
+
+import re
+
+import pytest
+
+FILENAMES = ["clip[1].mov", "so what?.wav", "IMG_0001.JPG", "IMG_0002.JPG", "notes.txt"]
+
+@pytest.fixture
+def search(web_interface, catalog_db):
+    """Catalog FILENAMES and return a function giving the filenames a search shows"""
+    catalog_db.execute("INSERT INTO drives (id, label) VALUES ('drive-1', 'Shelf A')")
+    catalog_db.executemany(
+        "INSERT INTO files (id, drive_id, path, filename, size_bytes) VALUES (?, 'drive-1', ?, ?, 1024)",
+        [(f"file-{index}", f"Shoot/{filename}", filename) for index, filename in enumerate(FILENAMES)]
+    )
+    catalog_db.commit()
+    client = web_interface.app.test_client()
+
+    def run(query):
+        page = client.get("/search", query_string={"query": query, "type": "filename"}).get_data(as_text=True)
+        file_ids = re.findall(r'href="/file/file-(\d+)"', page)
+        return sorted(FILENAMES[int(index)] for index in file_ids)
+    return run
+
+@pytest.mark.parametrize("query", ["clip[1]", "clip[1].mov", "[1]"])
+def test_brackets_are_searched_for_as_text(search, query):
+    assert search(query) == ["clip[1].mov"]
+
+def test_wildcard_matching_nothing_falls_back_to_substring_search(search):
+    # As a GLOB pattern this only matches whole names like "what1.wav"
+    assert search("what?.wav") == ["so what?.wav"]
+
+def test_wildcards_match_with_glob(search):
+    assert search("IMG_*.JPG") == ["IMG_0001.JPG", "IMG_0002.JPG"]
+    assert search("IMG_000?.JPG") == ["IMG_0001.JPG", "IMG_0002.JPG"]
@@ -0,0 +1,20 @@
+"""Helpers shared by the web interface's pages"""
+
+import pytest
+
+@pytest.mark.parametrize("size_bytes, expected", [
+    (0, "0 B"),
+    (1023, "1023 B"),
+    (1024, "1.00 KB"),
+    (1536, "1.50 KB"),
+    (5 * 1024**2, "5.00 MB"),
+    (3 * 1024**3, "3.00 GB"),
+    (2048 * 1024**3, "2048.00 GB"),
+    # SQLite SUM() over REAL values, or a mix, gives a float
+    (512.0, "512.0 B"),
+    (1023.5, "1023.5 B"),
+    (1536.0, "1.50 KB"),
+    (2.5 * 1024**3, "2.50 GB"),
+])
+def test_format_filesize(web_interface, size_bytes, expected):
+    assert web_interface.format_filesize(size_bytes) == expected
@@ -5,7 +5,7 @@ CSV to XLSX converter script that uses the Go csv2xlsx tool.
 
 import os
 import sys
-import tempfile
+import shutil
 import subprocess
 from pathlib import Path
 
@@ -13,78 +13,90 @@ from pathlib import Path
 SCRIPT_DIR = Path(__file__).parent.absolute()
 CSV2XLSX_BIN = SCRIPT_DIR / "csv2xlsx"
 
+# Keep copies of the input, command and output under debug/ when set
+DEBUG = bool(os.environ.get('VAULTKEEPER_DEBUG'))
+DEBUG_DIR = SCRIPT_DIR / "debug"
+
 def convert_csv_to_xlsx(csv_data, delimiter=","):
     """
     Convert CSV data to XLSX format using the csv2xlsx Go tool.
     
     Args:
-        csv_data (str): CSV content as a string
+        csv_data (str, bytes, path or file): CSV content as a string or UTF-8
+            bytes, a path to a CSV file (os.PathLike), or a binary file object
         delimiter (str): CSV delimiter character
         
     Returns:
         bytes: The XLSX file content as bytes
     """
-    # Create temporary files for input and output
-    debug_dir = Path(SCRIPT_DIR) / "debug"
-    debug_dir.mkdir(exist_ok=True)
-    debug_csv = debug_dir / "debug_input.csv"
-    
-    # Log the CSV data for debugging
-    with open(debug_csv, 'w') as f:
-        f.write(csv_data)
-    
-    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as temp_csv:
-        temp_csv_path = temp_csv.name
-        temp_csv.write(csv_data.encode('utf-8'))
+    # A file on disk is read by csv2xlsx itself; other content is piped to
+    # its stdin. Content that arrives as bytes (e.g. an upload) is passed
+    # through as is
+    input_path = "/dev/stdin"
+    if isinstance(csv_data, os.PathLike):
+        input_path = os.fspath(csv_data)
+        csv_data = None
+    elif hasattr(csv_data, 'read'):
+        csv_data = csv_data.read()
+    if isinstance(csv_data, str):
+        csv_data = csv_data.encode('utf-8')
     
-    temp_xlsx_path = temp_csv_path.replace('.csv', '.xlsx')
-    debug_xlsx = debug_dir / "debug_output.xlsx"
+    if DEBUG:
+        DEBUG_DIR.mkdir(exist_ok=True)
+        
+        # Log the CSV data for debugging
+        if csv_data is None:
+            shutil.copyfile(input_path, DEBUG_DIR / "debug_input.csv")
+        else:
+            with open(DEBUG_DIR / "debug_input.csv", 'wb') as f:
+                f.write(csv_data)
     
     try:
-        # Run the csv2xlsx tool
+        # Run the csv2xlsx tool, reading the XLSX back from its stdout rather
+        # than through a temporary file
         cmd = [
             str(CSV2XLSX_BIN),
-            "-f", temp_csv_path,
-            "-o", temp_xlsx_path,
+            "-f", input_path,
+            "-o", "/dev/stdout",
             "-d", delimiter
         ]
         
-        # Log the command for debugging
-        with open(debug_dir / "debug_cmd.log", 'w') as f:
-            f.write(' '.join(cmd))
+        result = subprocess.run(cmd, input=csv_data, capture_output=True)
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # csv2xlsx prints CSV parse errors to stdout ahead of the workbook
+        # it saves from the rows read so far
+        xlsx_start = result.stdout.find(b"PK\x03\x04")
+        messages = result.stdout[:xlsx_start] if xlsx_start > 0 else b""
         
-        # Log the command output
-        with open(debug_dir / "debug_output.log", 'w') as f:
-            f.write(f"Return code: {result.returncode}\n")
-            f.write(f"Stdout: {result.stdout}\n")
-            f.write(f"Stderr: {result.stderr}\n")
+        if DEBUG:
+            # Log the command and its output
+            with open(DEBUG_DIR / "debug_cmd.log", 'w') as f:
+                f.write(' '.join(cmd))
+            with open(DEBUG_DIR / "debug_output.log", 'w') as f:
+                f.write(f"Return code: {result.returncode}\n")
+                f.write(f"Stdout: {messages.decode('utf-8', 'replace')}\n")
+                f.write(f"Stderr: {result.stderr.decode('utf-8', 'replace')}\n")
         
         if result.returncode != 0:
-            sys.stderr.write(f"Error running csv2xlsx: {result.stderr}")
+            sys.stderr.write(f"Error running csv2xlsx: {result.stderr.decode('utf-8', 'replace')}")
             return None
-            
-        # Read the resulting XLSX file
-        with open(temp_xlsx_path, 'rb') as xlsx_file:
-            xlsx_data = xlsx_file.read()
         
-        # Copy the XLSX file for debugging
-        with open(debug_xlsx, 'wb') as f:
-            f.write(xlsx_data)
+        if xlsx_start < 0:
+            sys.stderr.write(f"csv2xlsx produced no output: {result.stdout.decode('utf-8', 'replace')}")
+            return None
+        
+        xlsx_data = result.stdout[xlsx_start:]
+        
+        if DEBUG:
+            # Copy the XLSX file for debugging
+            with open(DEBUG_DIR / "debug_output.xlsx", 'wb') as f:
+                f.write(xlsx_data)
             
         return xlsx_data
         
     except Exception as e:
         sys.stderr.write(f"Exception during conversion: {str(e)}")
         return None
-        
-    finally:
-        # Clean up temporary files
-        if os.path.exists(temp_csv_path):
-            os.unlink(temp_csv_path)
-        if os.path.exists(temp_xlsx_path):
-            os.unlink(temp_xlsx_path)
 
 if __name__ == "__main__":
     # Simple command-line interface for testing
@@ -96,10 +108,7 @@ if __name__ == "__main__":
     output_file = sys.argv[2]
     delimiter = sys.argv[3] if len(sys.argv) > 3 else ","
     
-    with open(input_file, 'r') as f:
-        csv_data = f.read()
-    
-    xlsx_data = convert_csv_to_xlsx(csv_data, delimiter)
+    xlsx_data = convert_csv_to_xlsx(Path(input_file), delimiter)
     
     if xlsx_data:
         with open(output_file, 'wb') as f:
@@ -6,29 +6,150 @@ CSV to XLSX converter script using pandas.
 import os
 import sys
 import io
+from itertools import chain
+from pathlib import Path
 import pandas as pd
 
+# xlsxwriter is preferred; openpyxl is used when it isn't installed
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+    import openpyxl
+
+# Rows parsed per DataFrame while writing a workbook
+CHUNK_ROWS = 8192
+
+def infer_column_dtypes(chunks):
+    """
+    Work out the dtype one read_csv of the whole file would give each column,
+    from the dtypes inferred for each of its chunks.
+    
+    Chunks where a column is entirely missing say nothing about its type,
+    but a missing value anywhere turns an integer column into floats (and
+    a bool column into nullable booleans), as it does in a whole-file read.
+    Columns with no values at all are left for read_csv to infer.
+    """
+    seen = {}  # Maps columns to the dtypes inferred where they have values
+    has_missing = set()
+    for chunk in chunks:
+        for column in chunk.columns:
+            missing = chunk[column].isna()
+            if missing.any():
+                has_missing.add(column)
+            if missing.all():
+                continue
+            dtype = chunk[column].dtype
+            # A bool column with missing values comes back as objects
+            if dtype == object and chunk[column][~missing].map(type).eq(bool).all():
+                dtype = 'bool'
+            seen.setdefault(column, set()).add(dtype)
+    
+    dtypes = {}
+    for column, column_dtypes in seen.items():
+        if all(pd.api.types.is_bool_dtype(dtype) for dtype in column_dtypes):
+            dtypes[column] = 'boolean' if column in has_missing else 'bool'
+        elif (len(column_dtypes) == 1 and column not in has_missing
+              and pd.api.types.is_integer_dtype(next(iter(column_dtypes)))):
+            dtypes[column] = column_dtypes.pop()
+        elif all(pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype) for dtype in column_dtypes):
+            dtypes[column] = 'float64'
+        else:
+            # Text anywhere in a column keeps the whole column as text
+            dtypes[column] = str
+    return dtypes
+
+def read_csv_rows(csv_source, **read_options):
+    """
+    Yield the CSV header, then each row as a tuple with missing values as None.
+    
+    The CSV is parsed CHUNK_ROWS rows at a time, so only one chunk is held
+    as a DataFrame. When there is more than one chunk, a first pass works out
+    each column's type over the whole file and the second pass parses every
+    chunk with those types, so the output doesn't depend on where the chunk
+    boundaries fall. csv_source must be a path or a seekable file.
+    """
+    start = csv_source.tell() if hasattr(csv_source, 'seek') else None
+    
+    with pd.read_csv(csv_source, chunksize=CHUNK_ROWS, **read_options) as reader:
+        first_chunk = next(reader)
+        second_chunk = next(reader, None)
+        if second_chunk is not None:
+            dtypes = infer_column_dtypes(chain([first_chunk, second_chunk], reader))
+    
+    if second_chunk is None:
+        # A single chunk was already typed as a whole
+        chunks = [first_chunk]
+    else:
+        if start is not None:
+            csv_source.seek(start)
+        chunks = pd.read_csv(csv_source, chunksize=CHUNK_ROWS, dtype=dtypes, **read_options)
+    
+    for chunk_index, chunk in enumerate(chunks):
+        if chunk_index == 0:
+            yield tuple(chunk.columns)
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
 def convert_csv_to_xlsx(csv_data, delimiter=","):
     """
     Convert CSV data to XLSX format using pandas.
     
     Args:
-        csv_data (str): CSV content as a string
+        csv_data (str, bytes, path or file): CSV content as a string or UTF-8
+            bytes, a path to a CSV file (os.PathLike), or a file object
         delimiter (str): CSV delimiter character
         
     Returns:
         bytes: The XLSX file content as bytes
     """
     try:
-        # Read CSV data into a pandas DataFrame
-        df = pd.read_csv(io.StringIO(csv_data), delimiter=delimiter)
+        # Column types are still inferred so numbers land in number cells,
+        # but only empty fields are treated as missing instead of matching
+        # each against pandas' list of NA spellings ("NA", "null", "n/a", ...)
+        read_options = {
+            'delimiter': delimiter,
+            'engine': 'c',
+            'keep_default_na': False,
+            'na_values': [''],
+        }
+        
+        # Paths and file objects are read by pandas directly rather than
+        # copied into a string first
+        if isinstance(csv_data, str):
+            csv_source = io.StringIO(csv_data)
+        elif isinstance(csv_data, bytes):
+            csv_source = io.BytesIO(csv_data)
+        elif hasattr(csv_data, 'read') and not csv_data.seekable():
+            # Large files are typed in a first pass and then read again
+            content = csv_data.read()
+            csv_source = io.BytesIO(content) if isinstance(content, bytes) else io.StringIO(content)
+        else:
+            csv_source = csv_data
+        
+        rows = read_csv_rows(csv_source, **read_options)
         
         # Create an in-memory Excel writer
         output = io.BytesIO()
         
-        # Write the data to an Excel file
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Sheet1', index=False)
+        # Write the data to an Excel file, a row at a time rather than through
+        # df.to_excel, which formats each cell separately
+        if xlsxwriter is not None:
+            # URL-like strings stay plain text, as openpyxl writes them;
+            # xlsxwriter would otherwise turn them into hyperlink cells
+            workbook = xlsxwriter.Workbook(output, {'in_memory': True, 'strings_to_urls': False})
+            worksheet = workbook.add_worksheet('Sheet1')
+            for row_index, row in enumerate(rows):
+                worksheet.write_row(row_index, 0, row)
+            workbook.close()
+        else:
+            # A write-only workbook streams rows out instead of building a
+            # cell object for every value
+            workbook = openpyxl.Workbook(write_only=True)
+            worksheet = workbook.create_sheet('Sheet1')
+            for row in rows:
+                worksheet.append(row)
+            workbook.save(output)
         
         # Get the Excel file content
         output.seek(0)
@@ -48,10 +169,7 @@ if __name__ == "__main__":
     output_file = sys.argv[2]
     delimiter = sys.argv[3] if len(sys.argv) > 3 else ","
     
-    with open(input_file, 'r') as f:
-        csv_data = f.read()
-    
-    xlsx_data = convert_csv_to_xlsx(csv_data, delimiter)
+    xlsx_data = convert_csv_to_xlsx(Path(input_file), delimiter)
     
     if xlsx_data:
         with open(output_file, 'wb') as f:
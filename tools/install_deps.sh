@@ -2,6 +2,6 @@
 
 # Install required Python packages
 echo "Installing required Python packages..."
-pip install pandas openpyxl
+pip install pandas xlsxwriter
 
 echo "Dependencies installed successfully."
\ No newline at end of file